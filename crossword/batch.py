@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import sys
+import time
+
+from crossword import Crossword, Vocabulary
+from generate import CrosswordCreator
+
+# Vocabulary shared by every puzzle solved in a worker process
+vocabulary = None
+
+
+def init_worker(shared_vocabulary):
+    """
+    Store the vocabulary loaded by the parent process for use by `solve`.
+    """
+    global vocabulary
+    vocabulary = shared_vocabulary
+
+
+def solve(structure, output_dir, save_images):
+    """
+    Solve the crossword in `structure` with the shared vocabulary and write
+    its text (and optionally image) output to `output_dir`.
+    Return a tuple of the structure file, whether it was solved, and the
+    time taken in seconds.
+    """
+    start = time.perf_counter()
+    crossword = Crossword(structure, vocabulary)
+    creator = CrosswordCreator(crossword)
+    assignment = creator.solve()
+
+    name = os.path.splitext(os.path.basename(structure))[0]
+    with open(os.path.join(output_dir, name + ".txt"), "w") as f:
+        if assignment is None:
+            f.write("No solution.\n")
+        else:
+            f.write(creator.text(assignment) + "\n")
+    if assignment is not None and save_images:
+        creator.save(assignment, os.path.join(output_dir, name + ".png"))
+
+    return structure, assignment is not None, time.perf_counter() - start
+
+
+def main():
+
+    # Check usage
+    usage = "Usage: python batch.py [--png] words structures output"
+    args = sys.argv[1:]
+    save_images = False
+    if args and args[0] == "--png":
+        save_images = True
+        args.pop(0)
+    if len(args) != 3:
+        sys.exit(usage)
+
+    # Parse command-line arguments
+    words, structures, output_dir = args
+    structure_files = sorted(
+        os.path.join(structures, filename)
+        for filename in os.listdir(structures)
+        if filename.endswith(".txt")
+    )
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Load and index vocabulary once for all puzzles
+    start = time.perf_counter()
+    shared_vocabulary = Vocabulary(words)
+    print(f"Loaded {len(shared_vocabulary.words)} words "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    # Solve puzzles concurrently
+    with multiprocessing.Pool(
+        initializer=init_worker, initargs=(shared_vocabulary,)
+    ) as pool:
+        results = pool.starmap(
+            solve,
+            [(structure, output_dir, save_images) for structure in structure_files]
+        )
+    total = time.perf_counter() - start
+
+    # Report latency and throughput
+    for structure, solved, latency in results:
+        status = "solved" if solved else "no solution"
+        print(f"{structure}: {status} in {latency:.3f}s")
+    print(f"{len(results)} puzzles in {total:.2f}s "
+          f"({len(results) / total:.1f} puzzles/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,9 +35,46 @@ class Variable():
         return f"Variable({self.i}, {self.j}, {direction}, {self.length})"
 
 
+class Vocabulary():
+
+    def __init__(self, words_file):
+        """
+        Load a vocabulary list and index it by word length and by the
+        letter found at each position.
+        """
+        with open(words_file) as f:
+            self.words = set(f.read().upper().splitlines())
+
+        # Map length to the set of words of that length
+        self.by_length = dict()
+
+        # Map (length, index, letter) to the set of words of that length
+        # with `letter` at position `index`
+        self.by_position = dict()
+
+        for word in self.words:
+            self.by_length.setdefault(len(word), set()).add(word)
+            for index, letter in enumerate(word):
+                self.by_position.setdefault(
+                    (len(word), index, letter), set()
+                ).add(word)
+
+    def words_of_length(self, length):
+        """Return set of words with the given length."""
+        return self.by_length.get(length, set())
+
+    def words_with(self, length, index, letter):
+        """Return set of words of `length` with `letter` at `index`."""
+        return self.by_position.get((length, index, letter), set())
+
+
 class Crossword():
 
     def __init__(self, structure_file, words_file):
+        """
+        Create a crossword from a structure file. `words_file` is either a
+        path to a vocabulary list or an already loaded `Vocabulary`.
+        """
 
         # Determine structure of crossword
         with open(structure_file) as f:
@@ -58,8 +95,11 @@ class Crossword():
                 self.structure.append(row)
 
         # Save vocabulary list
-        with open(words_file) as f:
-            self.words = set(f.read().upper().splitlines())
+        if isinstance(words_file, Vocabulary):
+            self.vocabulary = words_file
+        else:
+            self.vocabulary = Vocabulary(words_file)
+        self.words = self.vocabulary.words
 
         # Determine variable set
         self.variables = set()
@@ -1,17 +1,30 @@
+import multiprocessing
+import os
+import random
+import string
 import sys
+import time
+
+from collections import Counter
 
 from crossword import *
 
 
 class CrosswordCreator():
 
-    def __init__(self, crossword):
+    def __init__(self, crossword, lcv_limit=None, seed=None):
         """
         Create new CSP crossword generate.
+
+        `lcv_limit` caps the domain size for which values are ordered by the
+        least-constraining-value heuristic; larger domains are left unordered.
+        `seed`, if given, breaks ties between equally ranked values randomly.
         """
         self.crossword = crossword
+        self.lcv_limit = lcv_limit
+        self.random = random.Random(seed) if seed is not None else None
         self.domains = {
-            var: self.crossword.words.copy()
+            var: self.crossword.vocabulary.words_of_length(var.length).copy()
             for var in self.crossword.variables
         }
 
@@ -31,27 +44,41 @@ class CrosswordCreator():
                 letters[i][j] = word[k]
         return letters
 
-    def print(self, assignment):
+    def text(self, assignment):
         """
-        Print crossword assignment to the terminal.
+        Return crossword assignment as a multi-line string.
         """
         letters = self.letter_grid(assignment)
+        rows = []
         for i in range(self.crossword.height):
+            row = ""
             for j in range(self.crossword.width):
                 if self.crossword.structure[i][j]:
-                    print(letters[i][j] or " ", end="")
+                    row += letters[i][j] or " "
                 else:
-                    print("█", end="")
-            print()
+                    row += "█"
+            rows.append(row)
+        return "\n".join(rows)
 
-    def save(self, assignment, filename):
+    def print(self, assignment):
         """
-        Save crossword assignment to an image file.
+        Print crossword assignment to the terminal.
         """
-        from PIL import Image, ImageDraw, ImageFont
-        cell_size = 100
-        cell_border = 2
-        interior_size = cell_size - 2 * cell_border
+        print(self.text(assignment))
+
+    def save(self, assignment, filename, cell_size=100):
+        """
+        Save crossword assignment to an image file, or to an SVG file if
+        `filename` ends in `.svg`.
+        """
+        if filename.lower().endswith(".svg"):
+            with open(filename, "w") as f:
+                f.write(self.svg(assignment, cell_size))
+            return
+
+        from PIL import Image
+        tiles = letter_tiles(cell_size)
+        cell_border = cell_border_size(cell_size)
         letters = self.letter_grid(assignment)
 
         # Create a blank canvas
@@ -61,30 +88,60 @@ class CrosswordCreator():
              self.crossword.height * cell_size),
             "black"
         )
-        font = ImageFont.truetype("assets/fonts/OpenSans-Regular.ttf", 80)
-        draw = ImageDraw.Draw(img)
 
+        # Paste a pre-rendered tile for every open cell. Text in the first
+        # row and column can start at a negative coordinate, which Pillow
+        # rounds differently, so those cells have tiles of their own
         for i in range(self.crossword.height):
             for j in range(self.crossword.width):
-
-                rect = [
-                    (j * cell_size + cell_border,
-                     i * cell_size + cell_border),
-                    ((j + 1) * cell_size - cell_border,
-                     (i + 1) * cell_size - cell_border)
-                ]
                 if self.crossword.structure[i][j]:
-                    draw.rectangle(rect, fill="white")
-                    if letters[i][j]:
-                        w, h = draw.textsize(letters[i][j], font=font)
-                        draw.text(
-                            (rect[0][0] + ((interior_size - w) / 2),
-                             rect[0][1] + ((interior_size - h) / 2) - 10),
-                            letters[i][j], fill="black", font=font
-                        )
+                    key = (letters[i][j], i == 0, j == 0)
+                    if key not in tiles:
+                        tiles[key] = render_tile(*key, cell_size)
+                    img.paste(
+                        tiles[key],
+                        (j * cell_size + cell_border,
+                         i * cell_size + cell_border)
+                    )
 
         img.save(filename)
 
+    def svg(self, assignment, cell_size=100):
+        """
+        Return crossword assignment as an SVG document string.
+        """
+        cell_border = cell_border_size(cell_size)
+        interior_size = cell_size - 2 * cell_border
+        letters = self.letter_grid(assignment)
+        width = self.crossword.width * cell_size
+        height = self.crossword.height * cell_size
+
+        elements = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{width}" height="{height}">',
+            f'<rect width="{width}" height="{height}" fill="black"/>'
+        ]
+        for i in range(self.crossword.height):
+            for j in range(self.crossword.width):
+                if not self.crossword.structure[i][j]:
+                    continue
+                x = j * cell_size + cell_border
+                y = i * cell_size + cell_border
+                elements.append(
+                    f'<rect x="{x}" y="{y}" width="{interior_size + 1}" '
+                    f'height="{interior_size + 1}" fill="white"/>'
+                )
+                if letters[i][j]:
+                    elements.append(
+                        f'<text x="{x + interior_size / 2}" '
+                        f'y="{y + interior_size / 2}" '
+                        f'font-family="Open Sans" font-size="{cell_size * 0.8}" '
+                        f'text-anchor="middle" dominant-baseline="central">'
+                        f'{letters[i][j]}</text>'
+                    )
+        elements.append("</svg>")
+        return "\n".join(elements) + "\n"
+
     def solve(self):
         """
         Enforce node and arc consistency, and then solve the CSP.
@@ -122,14 +179,19 @@ class CrosswordCreator():
         bool_return = False
 
         if crossover is not None:
-            words_for_removal = set()
-            for word in self.domains[x]:
-                if all(other_words[crossover[1]] != word[crossover[0]] for other_words in self.domains[y]):
-                    words_for_removal.add(word)
-                    bool_return = True
-            #removing the difference between the words_for_removal and the domain of x.
+            #words of x are supported by any word of y sharing the letter at
+            #the crossover, which the vocabulary index gives us directly.
+            i, j = crossover
+            letters = set(other_word[j] for other_word in self.domains[y])
+            supported = set()
+            for letter in letters:
+                supported.update(
+                    self.crossword.vocabulary.words_with(x.length, i, letter)
+                )
             #we keep only the words that are arc consistent
-            self.domains[x] = self.domains[x].difference(words_for_removal)
+            revised = self.domains[x].intersection(supported)
+            bool_return = len(revised) != len(self.domains[x])
+            self.domains[x] = revised
 
         return bool_return
 
@@ -230,24 +292,38 @@ class CrosswordCreator():
         the number of values they rule out for neighboring variables.
         The first value in the list, for example, should be the one
         that rules out the fewest values among the neighbors of `var`.
-        """
-        word_dict = {} 
 
-        for word in self.domains[var]:
-            word_dict.update({word : 0}) 
-            for variable in assignment:
-                if var == variable:
-                    continue
-                crossover = self.crossword.overlaps[var, variable]
-                if crossover is None:
-                    continue
-                for other_word in self.domains[variable]:
-                    #if it rules out a word we increase its value by 1.
-                    if word[crossover[0]] != other_word[crossover[1]]:
-                        word_dict[word] += 1
+        If `self.lcv_limit` is set and the domain of `var` is larger than
+        it, the values are returned unordered to keep the ordering cheap.
+        """
+        values = list(self.domains[var])
+        #shuffling first so the stable sort below breaks ties randomly
+        if self.random is not None:
+            self.random.shuffle(values)
+
+        if self.lcv_limit is not None and len(values) > self.lcv_limit:
+            return values
+
+        #for every unassigned neighbour build a histogram of the letters its
+        #words have at the crossover, so a word of `var` rules out every
+        #neighbour word except the ones sharing its letter at that position.
+        histograms = []
+        for neighbour in self.crossword.neighbors(var):
+            if neighbour in assignment:
+                continue
+            x, y = self.crossword.overlaps[var, neighbour]
+            letter_counts = Counter(word[y] for word in self.domains[neighbour])
+            histograms.append((x, len(self.domains[neighbour]), letter_counts))
+
+        word_dict = {}
+        for word in values:
+            word_dict[word] = sum(
+                size - letter_counts[word[x]]
+                for x, size, letter_counts in histograms
+            )
 
         #sorted in increasing order
-        sorted_word_list = sorted(word_dict, key=word_dict.get )
+        sorted_word_list = sorted(word_dict, key=word_dict.get)
 
         return sorted_word_list
 
@@ -295,36 +371,265 @@ class CrosswordCreator():
         `assignment` is a mapping from variables (keys) to words (values).
 
         If no assignment is possible, return None.
+
+        The search uses conflict-directed backjumping: when every word for a
+        variable fails, it jumps straight back to the most recent variable
+        responsible, and records the responsible partial assignment as a
+        nogood so later branches containing it are pruned immediately.
+        `self.backjumps` and `self.nogood_hits` count both events.
+        """
+        self.backjumps = 0
+        self.nogood_hits = 0
+        self.nogoods = dict()
+        result, _ = self.backjump(assignment)
+        return result
+
+    def conflicts(self, var, word, assignment):
+        """
+        Return set of assigned variables that conflict with assigning
+        `word` to `var`, either by reusing the word or by disagreeing on
+        the letter where they cross.
+        """
+        culprits = set()
+        for other_var, other_word in assignment.items():
+            if other_var == var:
+                continue
+            if word == other_word:
+                culprits.add(other_var)
+                continue
+            crossover = self.crossword.overlaps[var, other_var]
+            if crossover and word[crossover[0]] != other_word[crossover[1]]:
+                culprits.add(other_var)
+        return culprits
+
+    def matching_nogood(self, var, word, assignment):
+        """
+        Return a recorded nogood containing `var` = `word` whose other
+        assignments all hold in `assignment`, or None if there is none.
+        """
+        for nogood in self.nogoods.get((var, word), ()):
+            if all(assignment.get(other_var) == other_word
+                   for other_var, other_word in nogood
+                   if other_var != var):
+                return nogood
+        return None
+
+    def record_nogood(self, assignment, culprits):
+        """
+        Remember that the assignments of `culprits` in `assignment` cannot
+        be extended to a solution.
+        """
+        nogood = frozenset((var, assignment[var]) for var in culprits)
+        for item in nogood:
+            self.nogoods.setdefault(item, []).append(nogood)
+
+    def backjump(self, assignment):
+        """
+        Extend `assignment` to a complete one. Return a tuple of the complete
+        assignment (or None) and, on failure, the set of assigned variables
+        whose values caused it (the conflict set).
         """
         #the break condition
-        if self.assignment_complete( assignment):
-            return assignment
+        if self.assignment_complete(assignment):
+            return assignment, set()
+
+        var = self.select_unassigned_variable(assignment)
+        conflict_set = set()
+        for word in self.order_domain_values(var, assignment):
+            culprits = self.conflicts(var, word, assignment)
+            if culprits:
+                conflict_set.update(culprits)
+                continue
+
+            nogood = self.matching_nogood(var, word, assignment)
+            if nogood is not None:
+                self.nogood_hits += 1
+                conflict_set.update(
+                    other_var for other_var, _ in nogood if other_var != var
+                )
+                continue
 
-        var = self.select_unassigned_variable( assignment)
-        for word in self.order_domain_values( var, assignment):
             assignment[var] = word
-            if self.consistent( assignment):
-                result = self.backtrack( assignment)
-                if result is not None: 
-                    return result
+            result, child_conflicts = self.backjump(assignment)
+            if result is not None:
+                return result, set()
             assignment.pop(var)
-        return None
+
+            #if var played no part in the failure below, no other word for it
+            #can help either, so jump back past it.
+            if var not in child_conflicts:
+                self.backjumps += 1
+                return None, child_conflicts
+            conflict_set.update(child_conflicts)
+
+        conflict_set.discard(var)
+        self.record_nogood(assignment, conflict_set)
+        return None, conflict_set
+
+# Pre-rendered cell tiles, keyed by cell size and then by a tuple of the
+# letter (None for an empty cell) and whether the cell is in the first row
+# and in the first column
+_tile_atlas = dict()
+
+
+def cell_border_size(cell_size):
+    """Return the width of the black border around each cell."""
+    return max(1, cell_size // 50)
+
+
+def load_font(size):
+    """Return the crossword font at the given size."""
+    from PIL import ImageFont
+    path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "assets", "fonts", "OpenSans-Regular.ttf"
+    )
+    return ImageFont.truetype(path, size)
+
+
+def render_tile(letter, first_row, first_column, cell_size):
+    """
+    Return image of the white interior of a cell of `cell_size` pixels,
+    with `letter` drawn centred in it (or blank if `letter` is None).
+
+    The letter is drawn at the same fractional coordinates as on the full
+    canvas, so the tile matches drawing on the canvas pixel for pixel.
+    Cells in the first row or column are drawn at the canvas origin and
+    all others one cell in, as the sign of a coordinate changes how it is
+    rounded.
+    """
+    from PIL import Image, ImageDraw
+    cell_border = cell_border_size(cell_size)
+    interior_size = cell_size - 2 * cell_border
+    x = (0 if first_column else cell_size) + cell_border
+    y = (0 if first_row else cell_size) + cell_border
+    tile = Image.new("RGBA", (x + interior_size + 1, y + interior_size + 1), "white")
+    if letter:
+        font = load_font(int(cell_size * 0.8))
+        draw = ImageDraw.Draw(tile)
+        _, _, w, h = draw.textbbox((0, 0), letter, font=font)
+        draw.text(
+            (x + ((interior_size - w) / 2),
+             y + ((interior_size - h) / 2) - cell_size / 10),
+            letter, fill="black", font=font
+        )
+    return tile.crop((x, y, x + interior_size + 1, y + interior_size + 1))
+
+
+def letter_tiles(cell_size):
+    """
+    Return dictionary mapping (letter, first row, first column) to cell
+    tiles of `cell_size` pixels, rendering the blank tile and A-Z for
+    every position the first time it is called.
+    """
+    if cell_size not in _tile_atlas:
+        tiles = dict()
+        for letter in [None, *string.ascii_uppercase]:
+            for first_row in (False, True):
+                for first_column in (False, True):
+                    key = (letter, first_row, first_column)
+                    tiles[key] = render_tile(*key, cell_size)
+        _tile_atlas[cell_size] = tiles
+    return _tile_atlas[cell_size]
+
+
+def solve_configuration(structure, words, config):
+    """
+    Solve the crossword in `structure` with `words` using a
+    CrosswordCreator built from the keyword arguments in `config`.
+    Return a tuple of `config` and the assignment (None if unsolvable).
+    """
+    crossword = Crossword(structure, words)
+    creator = CrosswordCreator(crossword, **config)
+    return config, creator.solve()
+
+
+def default_portfolio(size):
+    """
+    Return `size` CrosswordCreator configurations: the plain deterministic
+    search followed by randomly seeded ones, every other one without LCV.
+    """
+    configs = [dict()]
+    for seed in range(1, size):
+        configs.append({"seed": seed, "lcv_limit": None if seed % 2 else 0})
+    return configs
+
+
+def solve_portfolio(structure, words, configs, time_limit=None):
+    """
+    Run one search per configuration in `configs` in a process pool and
+    return a tuple `(config, assignment)` from the first one to finish
+    with a solution, terminating the others.
+
+    Return `(None, None)` if every search fails, and raise
+    `multiprocessing.TimeoutError` if `time_limit` seconds pass first.
+    """
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    pool = multiprocessing.Pool(min(len(configs), multiprocessing.cpu_count()))
+    try:
+        results = pool.imap_unordered(
+            _solve_configuration, [(structure, words, config) for config in configs]
+        )
+        for _ in configs:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            config, assignment = results.next(timeout)
+            if assignment is not None:
+                return config, assignment
+        return None, None
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _solve_configuration(args):
+    return solve_configuration(*args)
+
 
 def main():
 
     # Check usage
-    if len(sys.argv) not in [3, 4]:
-        sys.exit("Usage: python generate.py structure words [output]")
+    usage = ("Usage: python generate.py [--portfolio N] [--time-limit SECONDS] "
+             "structure words [output]")
+    args = sys.argv[1:]
+    portfolio = None
+    time_limit = None
+    try:
+        while args and args[0].startswith("--"):
+            option = args.pop(0)
+            if option == "--portfolio":
+                portfolio = int(args.pop(0))
+            elif option == "--time-limit":
+                time_limit = float(args.pop(0))
+            else:
+                sys.exit(usage)
+    except (IndexError, ValueError):
+        sys.exit(usage)
+    if len(args) not in [2, 3]:
+        sys.exit(usage)
+    if time_limit is not None and portfolio is None:
+        sys.exit("--time-limit requires --portfolio")
 
     # Parse command-line arguments
-    structure = sys.argv[1]
-    words = sys.argv[2]
-    output = sys.argv[3] if len(sys.argv) == 4 else None
+    structure = args[0]
+    words = args[1]
+    output = args[2] if len(args) == 3 else None
 
     # Generate crossword
     crossword = Crossword(structure, words)
     creator = CrosswordCreator(crossword)
-    assignment = creator.solve()
+    if portfolio is None:
+        assignment = creator.solve()
+    else:
+        start = time.monotonic()
+        try:
+            config, assignment = solve_portfolio(
+                structure, words, default_portfolio(portfolio), time_limit
+            )
+        except multiprocessing.TimeoutError:
+            sys.exit(f"Timed out after {time_limit:g}s.")
+        if config is not None:
+            print(f"Solved by configuration {config} "
+                  f"in {time.monotonic() - start:.2f}s")
 
     # Print result
     if assignment is None:
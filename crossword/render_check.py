@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+
+from PIL import Image, ImageChops, ImageDraw
+
+from crossword import Crossword
+from generate import CrosswordCreator, load_font
+
+
+def draw_reference(creator, assignment, cell_size=100):
+    """
+    Return the image of the crossword assignment drawn cell by cell on the
+    canvas, as `CrosswordCreator.save` did before it pasted tiles.
+    """
+    cell_border = 2
+    interior_size = cell_size - 2 * cell_border
+    letters = creator.letter_grid(assignment)
+
+    img = Image.new(
+        "RGBA",
+        (creator.crossword.width * cell_size,
+         creator.crossword.height * cell_size),
+        "black"
+    )
+    font = load_font(80)
+    draw = ImageDraw.Draw(img)
+
+    for i in range(creator.crossword.height):
+        for j in range(creator.crossword.width):
+
+            rect = [
+                (j * cell_size + cell_border,
+                 i * cell_size + cell_border),
+                ((j + 1) * cell_size - cell_border,
+                 (i + 1) * cell_size - cell_border)
+            ]
+            if creator.crossword.structure[i][j]:
+                draw.rectangle(rect, fill="white")
+                if letters[i][j]:
+                    _, _, w, h = draw.textbbox((0, 0), letters[i][j], font=font)
+                    draw.text(
+                        (rect[0][0] + ((interior_size - w) / 2),
+                         rect[0][1] + ((interior_size - h) / 2) - 10),
+                        letters[i][j], fill="black", font=font
+                    )
+    return img
+
+
+def compare(structure, words):
+    """
+    Solve the crossword and return the number of pixels where the saved
+    image differs from the reference drawing, or None if it has no solution.
+    """
+    creator = CrosswordCreator(Crossword(structure, words))
+    assignment = creator.solve()
+    if assignment is None:
+        return None
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "crossword.png")
+        creator.save(assignment, filename)
+        with Image.open(filename) as saved:
+            difference = ImageChops.difference(
+                saved.convert("RGBA"), draw_reference(creator, assignment)
+            )
+
+    # A pixel differs if any of its bands do
+    bands = difference.split()
+    largest = bands[0]
+    for band in bands[1:]:
+        largest = ImageChops.lighter(largest, band)
+    return largest.width * largest.height - largest.histogram()[0]
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) % 2 != 1:
+        sys.exit("Usage: python render_check.py [structure words ...]")
+    pairs = list(zip(sys.argv[1::2], sys.argv[2::2])) or [
+        (os.path.join("data", f"structure{k}.txt"),
+         os.path.join("data", f"words{k}.txt"))
+        for k in range(3)
+    ]
+
+    failed = False
+    for structure, words in pairs:
+        pixels = compare(structure, words)
+        if pixels is None:
+            print(f"{structure}: no solution")
+        else:
+            print(f"{structure}: {pixels} pixels differ")
+            failed = failed or pixels > 0
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,130 @@
+import functools
 import itertools
-
-
-class Sentence():
+import multiprocessing
+import weakref
+
+from sat import SATSolver
+
+# Structurally equal sentences without any And or Or inside share one
+# object, keyed by class and constructor arguments
+_interned = weakref.WeakValueDictionary()
+
+
+def cached(slot):
+    """
+    Decorates a sentence method so its result is stored in `slot` and
+    reused until the sentence, or a sentence inside it, is mutated.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            value = getattr(self, slot)
+            if value is None:
+                value = method(self)
+                setattr(self, slot, value)
+            return value
+        return wrapper
+    return decorator
+
+
+class SentenceType(type):
+    """
+    Metaclass of sentences, returning the shared instance for sentences
+    that contain no And or Or instead of constructing a new one.
+    """
+
+    def __call__(cls, *args):
+        # Only share sentences whose whole tree is immutable
+        shared = cls.interned and all(
+            arg._shared for arg in args if isinstance(arg, Sentence)
+        )
+        key = (cls, args)
+        if shared:
+            try:
+                return _interned[key]
+            except (KeyError, TypeError):
+                pass
+
+        sentence = cls.__new__(cls)
+        sentence._hash = sentence._symbols = sentence._formula = None
+        sentence._parents = None
+        sentence._shared = shared
+        sentence.__init__(*args)
+
+        # Sentences that can change need to know what contains them
+        for arg in args:
+            if isinstance(arg, Sentence) and not arg._shared:
+                arg.add_parent(sentence)
+        if shared:
+            try:
+                _interned[key] = sentence
+            except TypeError:
+                pass
+        return sentence
+
+
+class Sentence(metaclass=SentenceType):
+
+    __slots__ = ("_hash", "_symbols", "_formula", "_shared", "_parents",
+                 "__weakref__")
+
+    # Whether structurally equal instances of the class are shared
+    interned = True
+
+    def add_parent(self, sentence):
+        """Records that `sentence` contains this sentence."""
+        if self._parents is None:
+            self._parents = weakref.WeakSet()
+        self._parents.add(sentence)
+
+    def invalidate(self):
+        """
+        Clears the cached values of this sentence and of every sentence
+        containing it, after it has been mutated in place.
+        """
+        stack = [self]
+        seen = set()
+        while stack:
+            sentence = stack.pop()
+            if id(sentence) in seen:
+                continue
+            seen.add(id(sentence))
+            sentence._hash = sentence._symbols = sentence._formula = None
+            if sentence._parents:
+                stack.extend(sentence._parents)
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
 
+    def evaluate_partial(self, model):
+        """
+        Evaluates the logical sentence in a model that may leave symbols
+        unassigned. Returns True or False if every completion of the model
+        gives that value, and None if it is not yet decided.
+        """
+        raise Exception("nothing to evaluate")
+
     def formula(self):
         """Returns string formula representing logical sentence."""
         return ""
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        return set(self.symbol_set())
+
+    def symbol_set(self):
+        """Returns a cached frozenset of all symbols in the logical sentence."""
+        return frozenset()
+
+    def expression(self, indices, vector=False):
+        """
+        Returns Python source evaluating the sentence, where symbol names
+        are mapped to integers by `indices`. The source reads the model
+        from a bitmask `m`, or, if `vector` is True, from a sequence `m`
+        of NumPy boolean arrays (one per symbol index).
+        """
+        raise Exception("nothing to compile")
 
     @classmethod
     def validate(cls, sentence):
@@ -44,15 +155,21 @@ class Sentence():
 
 class Symbol(Sentence):
 
+    __slots__ = ("name",)
+
     def __init__(self, name):
         self.name = name
 
     def __eq__(self, other):
         return isinstance(other, Symbol) and self.name == other.name
 
+    @cached("_hash")
     def __hash__(self):
         return hash(("symbol", self.name))
 
+    def __reduce__(self):
+        return (Symbol, (self.name,))
+
     def __repr__(self):
         return self.name
 
@@ -62,14 +179,29 @@ class Symbol(Sentence):
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
+    def evaluate_partial(self, model):
+        value = model.get(self.name)
+        return None if value is None else bool(value)
+
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    @cached("_symbols")
+    def symbol_set(self):
+        return frozenset([self.name])
+
+    def expression(self, indices, vector=False):
+        if self.name not in indices:
+            raise Exception(f"variable {self.name} not in model")
+        if vector:
+            return f"m[{indices[self.name]}]"
+        return f"(m >> {indices[self.name]} & 1)"
 
 
 class Not(Sentence):
+
+    __slots__ = ("operand",)
+
     def __init__(self, operand):
         Sentence.validate(operand)
         self.operand = operand
@@ -77,23 +209,42 @@ class Not(Sentence):
     def __eq__(self, other):
         return isinstance(other, Not) and self.operand == other.operand
 
+    @cached("_hash")
     def __hash__(self):
         return hash(("not", hash(self.operand)))
 
+    def __reduce__(self):
+        return (Not, (self.operand,))
+
     def __repr__(self):
         return f"Not({self.operand})"
 
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
+    def evaluate_partial(self, model):
+        value = self.operand.evaluate_partial(model)
+        return None if value is None else not value
+
+    @cached("_formula")
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    @cached("_symbols")
+    def symbol_set(self):
+        return self.operand.symbol_set()
+
+    def expression(self, indices, vector=False):
+        operand = self.operand.expression(indices, vector)
+        return f"(~{operand})" if vector else f"(not {operand})"
 
 
 class And(Sentence):
+
+    # Conjunctions can grow with `add`, so equal ones are not shared
+    __slots__ = ("conjuncts",)
+    interned = False
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
@@ -102,11 +253,15 @@ class And(Sentence):
     def __eq__(self, other):
         return isinstance(other, And) and self.conjuncts == other.conjuncts
 
+    @cached("_hash")
     def __hash__(self):
         return hash(
             ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
         )
 
+    def __reduce__(self):
+        return (And, tuple(self.conjuncts))
+
     def __repr__(self):
         conjunctions = ", ".join(
             [str(conjunct) for conjunct in self.conjuncts]
@@ -116,21 +271,50 @@ class And(Sentence):
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
+        if not conjunct._shared:
+            conjunct.add_parent(self)
+        self.invalidate()
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def evaluate_partial(self, model):
+        result = True
+        for conjunct in self.conjuncts:
+            value = conjunct.evaluate_partial(model)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+
+    @cached("_formula")
     def formula(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    @cached("_symbols")
+    def symbol_set(self):
+        return frozenset().union(
+            *[conjunct.symbol_set() for conjunct in self.conjuncts]
+        )
+
+    def expression(self, indices, vector=False):
+        if not self.conjuncts:
+            return "np.True_" if vector else "True"
+        operator = " & " if vector else " and "
+        return "(" + operator.join(
+            [conjunct.expression(indices, vector) for conjunct in self.conjuncts]
+        ) + ")"
 
 
 class Or(Sentence):
+
+    __slots__ = ("disjuncts",)
+    interned = False
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
@@ -139,11 +323,15 @@ class Or(Sentence):
     def __eq__(self, other):
         return isinstance(other, Or) and self.disjuncts == other.disjuncts
 
+    @cached("_hash")
     def __hash__(self):
         return hash(
             ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
         )
 
+    def __reduce__(self):
+        return (Or, tuple(self.disjuncts))
+
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
         return f"Or({disjuncts})"
@@ -151,17 +339,42 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def evaluate_partial(self, model):
+        result = False
+        for disjunct in self.disjuncts:
+            value = disjunct.evaluate_partial(model)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+
+    @cached("_formula")
     def formula(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    @cached("_symbols")
+    def symbol_set(self):
+        return frozenset().union(
+            *[disjunct.symbol_set() for disjunct in self.disjuncts]
+        )
+
+    def expression(self, indices, vector=False):
+        if not self.disjuncts:
+            return "np.False_" if vector else "False"
+        operator = " | " if vector else " or "
+        return "(" + operator.join(
+            [disjunct.expression(indices, vector) for disjunct in self.disjuncts]
+        ) + ")"
 
 
 class Implication(Sentence):
+
+    __slots__ = ("antecedent", "consequent")
+
     def __init__(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
@@ -173,9 +386,13 @@ class Implication(Sentence):
                 and self.antecedent == other.antecedent
                 and self.consequent == other.consequent)
 
+    @cached("_hash")
     def __hash__(self):
         return hash(("implies", hash(self.antecedent), hash(self.consequent)))
 
+    def __reduce__(self):
+        return (Implication, (self.antecedent, self.consequent))
+
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
 
@@ -183,16 +400,39 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def evaluate_partial(self, model):
+        antecedent = self.antecedent.evaluate_partial(model)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.evaluate_partial(model)
+        if consequent is True:
+            return True
+        if antecedent is True and consequent is False:
+            return False
+        return None
+
+    @cached("_formula")
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    @cached("_symbols")
+    def symbol_set(self):
+        return self.antecedent.symbol_set() | self.consequent.symbol_set()
+
+    def expression(self, indices, vector=False):
+        antecedent = self.antecedent.expression(indices, vector)
+        consequent = self.consequent.expression(indices, vector)
+        if vector:
+            return f"(~{antecedent} | {consequent})"
+        return f"(not {antecedent} or {consequent})"
 
 
 class Biconditional(Sentence):
+
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
@@ -204,9 +444,13 @@ class Biconditional(Sentence):
                 and self.left == other.left
                 and self.right == other.right)
 
+    @cached("_hash")
     def __hash__(self):
         return hash(("biconditional", hash(self.left), hash(self.right)))
 
+    def __reduce__(self):
+        return (Biconditional, (self.left, self.right))
+
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
 
@@ -216,23 +460,387 @@ class Biconditional(Sentence):
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def evaluate_partial(self, model):
+        left = self.left.evaluate_partial(model)
+        if left is None:
+            return None
+        right = self.right.evaluate_partial(model)
+        if right is None:
+            return None
+        return left == right
+
+    @cached("_formula")
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
-
-
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    @cached("_symbols")
+    def symbol_set(self):
+        return self.left.symbol_set() | self.right.symbol_set()
+
+    def expression(self, indices, vector=False):
+        left = self.left.expression(indices, vector)
+        right = self.right.expression(indices, vector)
+        if vector:
+            return f"({left} == {right})"
+        return f"(bool({left}) == bool({right}))"
+
+
+class CNF():
+    """
+    Tseitin encoding of sentences into clauses over integer variables.
+
+    Every symbol and every compound sub-sentence gets its own variable, and
+    clauses are added making each compound variable equivalent to its
+    sub-sentence, so the clauses grow linearly with the sentences encoded.
+    """
+
+    def __init__(self):
+        self.variables = dict()
+        self.literals = dict()
+        self.clauses = []
+
+    def new_variable(self):
+        """Returns a fresh variable number."""
+        return len(self.variables) + len(self.literals) + 1
+
+    def literal(self, sentence):
+        """Returns the literal equivalent to `sentence`."""
+        if isinstance(sentence, Symbol):
+            if sentence.name not in self.variables:
+                self.variables[sentence.name] = self.new_variable()
+            return self.variables[sentence.name]
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+        if sentence in self.literals:
+            return self.literals[sentence]
+
+        if isinstance(sentence, And):
+            children = [self.literal(c) for c in sentence.conjuncts]
+        elif isinstance(sentence, Or):
+            children = [self.literal(d) for d in sentence.disjuncts]
+        elif isinstance(sentence, Implication):
+            children = [self.literal(sentence.antecedent),
+                        self.literal(sentence.consequent)]
+        elif isinstance(sentence, Biconditional):
+            children = [self.literal(sentence.left),
+                        self.literal(sentence.right)]
+        else:
+            raise TypeError(f"cannot encode {sentence!r}")
+
+        v = self.new_variable()
+        self.literals[sentence] = v
+        if isinstance(sentence, And):
+            self.clauses.extend([-v, c] for c in children)
+            self.clauses.append([v] + [-c for c in children])
+        elif isinstance(sentence, Or):
+            self.clauses.extend([v, -d] for d in children)
+            self.clauses.append([-v] + children)
+        elif isinstance(sentence, Implication):
+            a, b = children
+            self.clauses.extend([[-v, -a, b], [v, a], [v, -b]])
+        else:
+            a, b = children
+            self.clauses.extend([[-v, -a, b], [-v, a, -b],
+                                 [v, a, b], [v, -a, -b]])
+        return v
+
+    def add(self, sentence, value=True):
+        """Adds clauses requiring `sentence` to have the given truth value."""
+        literal = self.literal(sentence)
+        self.clauses.append([literal if value else -literal])
+
+    def solver(self):
+        """Returns a SATSolver over the clauses encoded so far."""
+        return SATSolver(self.new_variable() - 1, self.clauses)
+
+
+def sat_check(knowledge, query):
+    """
+    Checks if knowledge base entails query by asking a SAT solver whether
+    knowledge ∧ ¬query is unsatisfiable.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(query, False)
+    return cnf.solver().solve() is None
+
+
+def compile_sentence(sentence, indices, vector=False):
+    """
+    Compiles `sentence` into a function of a single model argument, see
+    `Sentence.expression` for how symbols are read from the model.
+    """
+    namespace = dict()
+    if vector:
+        import numpy as np
+        namespace["np"] = np
+    return eval("lambda m: " + sentence.expression(indices, vector), namespace)
+
+
+def compiled_check(knowledge, query, symbols):
+    """
+    Checks if knowledge base entails query by compiling both sentences and
+    evaluating them on every model encoded as a bitmask over `symbols`.
+    """
+    indices = {symbol: i for i, symbol in enumerate(symbols)}
+    knowledge = compile_sentence(knowledge, indices)
+    query = compile_sentence(query, indices)
+    for model in range(2 ** len(symbols)):
+        if knowledge(model) and not query(model):
+            return False
+    return True
+
+
+def vectorized_check(knowledge, query, symbols, block=16):
+    """
+    Checks if knowledge base entails query by evaluating compiled sentences
+    on blocks of up to 2 ** `block` models at once as NumPy boolean arrays.
+    """
+    import numpy as np
+    indices = {symbol: i for i, symbol in enumerate(symbols)}
+    knowledge = compile_sentence(knowledge, indices, vector=True)
+    query = compile_sentence(query, indices, vector=True)
+
+    # Low symbols vary within a block, high symbols are fixed per block
+    low = min(block, len(symbols))
+    offsets = np.arange(2 ** low)
+    low_columns = [(offsets >> i & 1).astype(bool) for i in range(low)]
+    for start in range(2 ** (len(symbols) - low)):
+        columns = low_columns + [
+            np.full(2 ** low, bool(start >> i & 1))
+            for i in range(len(symbols) - low)
+        ]
+        counter_models = np.logical_and(knowledge(columns),
+                                        np.logical_not(query(columns)))
+        if np.any(counter_models):
+            return False
+    return True
+
+
+def symbol_frequencies(sentence, counts=None):
+    """
+    Returns a dictionary mapping each symbol name in `sentence` to the
+    number of times it occurs, added to `counts` if given.
+    """
+    if counts is None:
+        counts = dict()
+    if isinstance(sentence, Symbol):
+        counts[sentence.name] = counts.get(sentence.name, 0) + 1
+    elif isinstance(sentence, Not):
+        symbol_frequencies(sentence.operand, counts)
+    elif isinstance(sentence, And):
+        for conjunct in sentence.conjuncts:
+            symbol_frequencies(conjunct, counts)
+    elif isinstance(sentence, Or):
+        for disjunct in sentence.disjuncts:
+            symbol_frequencies(disjunct, counts)
+    elif isinstance(sentence, Implication):
+        symbol_frequencies(sentence.antecedent, counts)
+        symbol_frequencies(sentence.consequent, counts)
+    elif isinstance(sentence, Biconditional):
+        symbol_frequencies(sentence.left, counts)
+        symbol_frequencies(sentence.right, counts)
+    return counts
+
+
+def pruned_check(knowledge, query, stats=None, model=None):
+    """
+    Checks if knowledge base entails query by enumerating models one
+    symbol at a time, most frequently occurring symbols first, and pruning
+    a branch as soon as the partial model decides the outcome: the
+    knowledge base is false, the query is true, or a counter-model has
+    been found.
+
+    If `model` is given, only its completions are checked.
+    """
+    model = dict() if model is None else dict(model)
+    counts = symbol_frequencies(query, symbol_frequencies(knowledge))
+    symbols = sorted(
+        (symbol for symbol in counts if symbol not in model),
+        key=lambda symbol: (-counts[symbol], symbol)
+    )
+
+    def check(index):
+        """Checks entailment in every completion of the current model."""
+        if stats is not None:
+            stats["models"] = stats.get("models", 0) + 1
+
+        knowledge_value = knowledge.evaluate_partial(model)
+        if knowledge_value is False:
+            return True
+        query_value = query.evaluate_partial(model)
+        if query_value is True:
+            return True
+        if knowledge_value is True and query_value is False:
+            return False
+
+        # Undecided partial model: branch on the next symbol
+        p = symbols[index]
+        for value in (True, False):
+            model[p] = value
+            if not check(index + 1):
+                del model[p]
+                return False
+        del model[p]
+        return True
+
+    return check(0)
+
+
+# Knowledge base and query checked by a `parallel_check` worker process
+_worker_sentences = None
+
+
+def _init_worker(knowledge, query):
+    global _worker_sentences
+    _worker_sentences = (knowledge, query)
+
+
+def _check_prefix(model):
+    knowledge, query = _worker_sentences
+    return pruned_check(knowledge, query, model=model)
+
+
+def parallel_check(knowledge, query, processes=None, depth=None):
+    """
+    Checks if knowledge base entails query by fixing the first `depth`
+    symbols in every possible way and checking the resulting subtrees of
+    the model space in a pool of `processes` worker processes. All workers
+    are stopped as soon as one subtree contains a counter-model.
+
+    By default one process is used per CPU and the model space is split
+    into about four subtrees per process.
+    """
+    counts = symbol_frequencies(query, symbol_frequencies(knowledge))
+    symbols = sorted(counts, key=lambda symbol: (-counts[symbol], symbol))
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if depth is None:
+        depth = (4 * processes - 1).bit_length()
+    depth = min(depth, len(symbols))
+
+    prefixes = [
+        dict(zip(symbols[:depth], values))
+        for values in itertools.product((True, False), repeat=depth)
+    ]
+    pool = multiprocessing.Pool(
+        processes, initializer=_init_worker, initargs=(knowledge, query)
+    )
+    try:
+        for entailed in pool.imap_unordered(_check_prefix, prefixes):
+            if not entailed:
+                return False
+        return True
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def models(knowledge, symbols=None):
+    """
+    Yields every model (a dictionary mapping symbol names to booleans) of
+    the knowledge base's symbols, plus any names in `symbols`, in which
+    the knowledge base is true. Models are produced lazily, and branches
+    where the knowledge base is already false are skipped.
+    """
+    counts = symbol_frequencies(knowledge)
+    for symbol in symbols or ():
+        counts.setdefault(symbol, 0)
+    order = sorted(counts, key=lambda symbol: (-counts[symbol], symbol))
+    model = dict()
+
+    def extend(index, decided):
+        """Yields the satisfying completions of the current model."""
+        if not decided:
+            value = knowledge.evaluate_partial(model)
+            if value is False:
+                return
+            decided = value is True
+        if index == len(order):
+            yield model.copy()
+            return
+        p = order[index]
+        for value in (True, False):
+            model[p] = value
+            yield from extend(index + 1, decided)
+        del model[p]
+
+    return extend(0, False)
+
+
+def model_check_all(knowledge, queries, method="enumerate"):
+    """
+    Checks which of `queries` the knowledge base entails, returning a list
+    of booleans in the same order.
+
+    With "enumerate" the models of the knowledge base are enumerated once
+    and every query is evaluated in each, stopping once all queries have
+    a counter-model. With "sat" the knowledge base is encoded once and a
+    single solver is asked about each query in turn, reusing the clauses
+    it learns.
+    """
+    queries = list(queries)
+    if method == "sat":
+        cnf = CNF()
+        cnf.add(knowledge)
+        literals = [cnf.literal(query) for query in queries]
+        solver = cnf.solver()
+        return [solver.solve([-literal]) is None for literal in literals]
+    elif method != "enumerate":
+        raise ValueError(f"unknown model checking method {method!r}")
+
+    symbols = set()
+    for query in queries:
+        symbols.update(query.symbol_set())
+    entailed = [True] * len(queries)
+    undecided = set(range(len(queries)))
+    for model in models(knowledge, symbols):
+        for i in list(undecided):
+            if not queries[i].evaluate(model):
+                entailed[i] = False
+                undecided.remove(i)
+        if not undecided:
+            break
+    return entailed
+
+
+def model_check(knowledge, query, method="prune", stats=None):
+    """
+    Checks if knowledge base entails query.
+
+    `method` selects the algorithm: "prune" enumerates partial models and
+    stops early once they decide the answer, "enumerate" checks every model
+    of the symbols, "compiled" does the same with the sentences compiled to Python
+    functions over bitmask models, "vectorized" evaluates many models at
+    once with NumPy, "parallel" splits the pruned enumeration across worker
+    processes, and "sat" uses the CNF encoding and a CDCL SAT solver.
+
+    If `stats` is a dictionary, the enumerating methods ("prune" and
+    "enumerate") count the models they evaluate in `stats["models"]`.
+    """
+    if method == "prune":
+        return pruned_check(knowledge, query, stats)
+    elif method == "parallel":
+        return parallel_check(knowledge, query)
+    elif method == "sat":
+        return sat_check(knowledge, query)
+    elif method in ("compiled", "vectorized"):
+        symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+        if method == "compiled":
+            return compiled_check(knowledge, query, symbols)
+        return vectorized_check(knowledge, query, symbols)
+    elif method != "enumerate":
+        raise ValueError(f"unknown model checking method {method!r}")
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
 
         # If model has an assignment for each symbol
         if not symbols:
+            if stats is not None:
+                stats["models"] = stats.get("models", 0) + 1
 
             # If knowledge base is true in model, then query must also be true
             if knowledge.evaluate(model):
@@ -0,0 +1,234 @@
+class SATSolver():
+    """
+    Conflict-driven clause learning (CDCL) SAT solver.
+
+    Clauses are lists of non-zero integers in DIMACS style: variable `v`
+    appears as the literal `v` when true and `-v` when false. The solver
+    uses two watched literals per clause for unit propagation, learns
+    first-UIP clauses from conflicts and backjumps non-chronologically.
+    """
+
+    def __init__(self, num_vars, clauses):
+        self.num_vars = num_vars
+        self.values = [None] * (num_vars + 1)
+        self.levels = [0] * (num_vars + 1)
+        self.reasons = [None] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.increment = 1.0
+        self.watches = {}
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+        self.unsatisfiable = False
+        self.conflicts = 0
+        self.decisions = 0
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def value(self, literal):
+        """Returns True, False or None for the current value of `literal`."""
+        value = self.values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def level(self):
+        """Returns the current decision level."""
+        return len(self.trail_limits)
+
+    def add_clause(self, clause):
+        """Adds an input clause, simplifying duplicates and tautologies."""
+        clause = list(dict.fromkeys(clause))
+        if any(-literal in clause for literal in clause):
+            return
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            value = self.value(clause[0])
+            if value is False:
+                self.unsatisfiable = True
+            elif value is None:
+                self.enqueue(clause[0], None)
+        else:
+            self.watch(clause)
+
+    def watch(self, clause):
+        """Watches the first two literals of `clause`."""
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def enqueue(self, literal, reason):
+        """Makes `literal` true at the current level because of `reason`."""
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = self.level()
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Performs unit propagation over the watched literals.
+        Returns a conflicting clause, or None if there is no conflict.
+        """
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches.get(false_literal, [])
+            self.watches[false_literal] = kept = []
+            for index, clause in enumerate(watching):
+
+                # Keep the false literal in position 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                # Clause already satisfied by its other watch
+                if self.value(clause[0]) is True:
+                    kept.append(clause)
+                    continue
+
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watching[index + 1:])
+                        return clause
+                    self.enqueue(clause[0], clause)
+        return None
+
+    def analyze(self, conflict):
+        """
+        Derives the first-UIP learned clause from a conflicting clause.
+        Returns the learned clause (asserting literal first) and the
+        level to backjump to.
+        """
+        seen = set()
+        learned = []
+        pending = 0
+        literal = None
+        index = len(self.trail) - 1
+        reason = conflict
+
+        while True:
+            for other in reason:
+                if other == literal:
+                    continue
+                variable = abs(other)
+                if variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == self.level():
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Walk back along the trail to the next literal involved
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            reason = self.reasons[abs(literal)]
+
+        learned.insert(0, -literal)
+        if len(learned) == 1:
+            return learned, 0
+
+        # Watch the literal with the highest level after the asserting one
+        highest = max(range(1, len(learned)),
+                      key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def bump(self, variable):
+        """Raises the branching activity of a variable involved in a conflict."""
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+
+    def backjump(self, level):
+        """Undoes all assignments made above decision level `level`."""
+        if self.level() <= level:
+            return
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            self.values[abs(literal)] = None
+            self.reasons[abs(literal)] = None
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.head = len(self.trail)
+
+    def decide(self):
+        """Returns the unassigned variable with the highest activity, if any."""
+        best = None
+        for variable in range(1, self.num_vars + 1):
+            if self.values[variable] is None and (
+                best is None or self.activity[variable] > self.activity[best]
+            ):
+                best = variable
+        return best
+
+    def solve(self, assumptions=()):
+        """
+        Returns a satisfying model as a dict mapping each variable to a
+        boolean, or None if the clauses (together with the literals in
+        `assumptions`) are unsatisfiable.
+        """
+        if self.unsatisfiable:
+            return None
+        self.backjump(0)
+        if self.propagate() is not None:
+            self.unsatisfiable = True
+            return None
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.level() <= len(assumptions):
+                    if self.level() == 0:
+                        self.unsatisfiable = True
+                    self.backjump(0)
+                    return None
+                learned, level = self.analyze(conflict)
+                self.backjump(max(level, 0))
+                if len(learned) == 1:
+                    self.enqueue(learned[0], None)
+                else:
+                    self.watch(learned)
+                    self.enqueue(learned[0], learned)
+                self.increment *= 1.05
+                continue
+
+            # Assume the given literals first, one per decision level
+            if self.level() < len(assumptions):
+                literal = assumptions[self.level()]
+                value = self.value(literal)
+                if value is False:
+                    self.backjump(0)
+                    return None
+                self.trail_limits.append(len(self.trail))
+                if value is None:
+                    self.enqueue(literal, None)
+                continue
+
+            variable = self.decide()
+            if variable is None:
+                model = {
+                    variable: self.values[variable]
+                    for variable in range(1, self.num_vars + 1)
+                }
+                self.backjump(0)
+                return model
+            self.decisions += 1
+            self.trail_limits.append(len(self.trail))
+            self.enqueue(-variable, None)
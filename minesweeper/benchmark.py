@@ -0,0 +1,118 @@
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+
+def play(height, width, mines, seed):
+    """
+    Play one game of the AI against a board generated from `seed`.
+    Return a dictionary with whether the AI won, the number of moves made
+    and the time taken by each call to `add_knowledge`, in seconds.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines)
+
+    latencies = []
+    won = False
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+        if move is None or game.is_mine(move):
+            break
+
+        start = time.perf_counter()
+        ai.add_knowledge(move, game.nearby_mines(move))
+        latencies.append(time.perf_counter() - start)
+
+        # Every safe cell revealed
+        if len(ai.moves_made) == height * width - mines:
+            won = True
+            break
+
+    return {"seed": seed, "won": won, "moves": len(latencies),
+            "latencies": latencies}
+
+
+def percentile(values, fraction):
+    """
+    Return the value at `fraction` of the way through sorted `values`.
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def report(games, height, width, mines, processes, seed):
+    """
+    Play `games` games in parallel, with seeds counting up from `seed`,
+    and return a summary of the results as a dictionary.
+    """
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(
+            play,
+            [(height, width, mines, seed + i) for i in range(games)]
+        )
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(
+        latency for result in results for latency in result["latencies"]
+    )
+    moves = [result["moves"] for result in results]
+    wins = sum(result["won"] for result in results)
+    return {
+        "board": {"height": height, "width": width, "mines": mines},
+        "games": games,
+        "seed": seed,
+        "wins": wins,
+        "win_rate": wins / games if games else None,
+        "moves_per_game": sum(moves) / games if games else None,
+        "add_knowledge_ms": {
+            name: None if value is None else value * 1000
+            for name, value in [
+                ("p50", percentile(latencies, 0.5)),
+                ("p90", percentile(latencies, 0.9)),
+                ("p99", percentile(latencies, 0.99)),
+                ("max", latencies[-1] if latencies else None),
+            ]
+        },
+        "elapsed_s": elapsed,
+        "losing_seeds": [
+            result["seed"] for result in results if not result["won"]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play Minesweeper games with the AI and report results."
+    )
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--mines", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game")
+    parser.add_argument("-o", "--output",
+                        help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    result = report(args.games, args.height, args.width, args.mines,
+                    args.processes, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI, count_configurations
+
+# Boards with many knowledge components: height, width, mines and the
+# number of random safe cells revealed before guessing
+BOARDS = [
+    (100, 100, 2000, 2500),
+    (300, 300, 13500, 4000),
+]
+
+
+def check(height, width, mines, revealed, time_budget, seed):
+    """
+    Reveal `revealed` random safe cells of a board generated from `seed`,
+    then time one guess. Return the number of knowledge components, the
+    number of them weighed exactly, whether every mine probability from
+    weighing them is valid, the guess and the time it took in seconds.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines,
+                       time_budget=time_budget)
+    safe = [(i, j) for i in range(height) for j in range(width)
+            if not game.board[i, j]]
+    for cell in random.sample(safe, revealed):
+        ai.add_knowledge(cell, game.nearby_mines(cell))
+
+    # Weigh every component small enough to enumerate, however long that
+    # takes, as the product of their configuration counts is far too large
+    # for floating point
+    components = ai.components()
+    results = [
+        count_configurations(component, max_cells=ai.max_component_cells)
+        for component in components
+    ]
+    results = [result for result in results if result is not None]
+    probabilities = dict()
+    interior_risk = ai.weigh_configurations(
+        results, len(ai.unknown) - len(ai.cell_index),
+        mines - len(ai.mines), probabilities
+    )
+    valid = all(0 <= p <= 1 for p in [interior_risk, *probabilities.values()])
+
+    # Forget the safe cells found, so the AI has to guess
+    ai.safe_queue.clear()
+    start = time.perf_counter()
+    move = ai.make_random_move()
+    return len(components), len(results), valid, move, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that guesses on large boards with hundreds of "
+                    "knowledge components succeed within the time budget."
+    )
+    parser.add_argument("--time-budget", type=float, default=0.2)
+    parser.add_argument("--slack", type=float, default=0.1,
+                        help="seconds a guess may take beyond the budget")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    failed = False
+    for height, width, mines, revealed in BOARDS:
+        components, weighed, valid, move, elapsed = check(
+            height, width, mines, revealed, args.time_budget, args.seed
+        )
+        print(f"{height}x{width}, {mines} mines, {revealed} revealed: "
+              f"{components} components, {weighed} weighed exactly"
+              f"{'' if valid else ' (invalid probabilities)'}, "
+              f"guessed {move} in {elapsed:.3f}s")
+        if not valid or move is None or elapsed > args.time_budget + args.slack:
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
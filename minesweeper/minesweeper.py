@@ -1,5 +1,10 @@
+import collections
 import itertools
+import math
 import random
+import time
+
+import numpy as np
 
 
 class Minesweeper():
@@ -12,23 +17,22 @@ class Minesweeper():
         # Set initial width, height, and number of mines
         self.height = height
         self.width = width
-        self.mines = set()
-
-        # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
 
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # Add mines randomly, sampling cells without replacement
+        self.board = np.zeros((height, width), dtype=bool)
+        positions = random.sample(range(height * width), mines)
+        self.board.flat[positions] = True
+        self.mines = set(divmod(position, width) for position in positions)
+
+        # Count mines around every cell at once by summing the eight
+        # shifted copies of the padded board (a 3x3 convolution)
+        padded = np.pad(self.board, 1).astype(np.int8)
+        self.counts = sum(
+            padded[1 + di:1 + di + height, 1 + dj:1 + dj + width]
+            for di in (-1, 0, 1)
+            for dj in (-1, 0, 1)
+            if (di, dj) != (0, 0)
+        )
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -41,7 +45,7 @@ class Minesweeper():
         for i in range(self.height):
             print("--" * self.width + "-")
             for j in range(self.width):
-                if self.board[i][j]:
+                if self.board[i, j]:
                     print("|X", end="")
                 else:
                     print("| ", end="")
@@ -50,7 +54,7 @@ class Minesweeper():
 
     def is_mine(self, cell):
         i, j = cell
-        return self.board[i][j]
+        return bool(self.board[i, j])
 
     def nearby_mines(self, cell):
         """
@@ -58,24 +62,28 @@ class Minesweeper():
         within one row and column of a given cell,
         not including the cell itself.
         """
+        i, j = cell
+        return int(self.counts[i, j])
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
-
-        return count
+    def reveal(self, cell):
+        """
+        Returns a dictionary mapping each cell revealed by clicking the
+        safe cell `cell` to its number of nearby mines. A cell with no
+        nearby mines also reveals all of its neighbors, so whole regions
+        without nearby mines open in one call.
+        """
+        revealed = {cell: self.nearby_mines(cell)}
+        frontier = [cell]
+        while frontier:
+            i, j = frontier.pop()
+            if self.counts[i, j] != 0:
+                continue
+            for k in range(max(0, i - 1), min(self.height, i + 2)):
+                for l in range(max(0, j - 1), min(self.width, j + 2)):
+                    if (k, l) not in revealed:
+                        revealed[(k, l)] = int(self.counts[k, l])
+                        frontier.append((k, l))
+        return revealed
 
     def won(self):
         """
@@ -89,26 +97,123 @@ class Sentence():
     Logical statement about a Minesweeper game
     A sentence consists of a set of board cells,
     and a count of the number of those cells which are mines.
+
+    Sentences are immutable and hashable. Cell (i, j) has index
+    i * width + j on a board of the given width, and cells are stored as
+    the index of the first one (`offset`) plus a bitmask of the others
+    relative to it, so a sentence stays a few rows of bits wherever it is
+    on the board. Subset tests and differences shift one mask to line up
+    the offsets and are then single integer operations.
+    The width defaults to 8, the board size of `Minesweeper`; cells
+    outside it raise ValueError rather than sharing a bit with another cell.
     """
 
-    def __init__(self, cells, count):
-        self.cells = set(cells)
-        self.count = count
+    __slots__ = ("offset", "mask", "count", "width", "_hash")
+
+    def __init__(self, cells, count, width=8):
+        indices = [Sentence.index(cell, width) for cell in cells]
+        offset = min(indices, default=0)
+        mask = 0
+        for index in indices:
+            mask |= 1 << (index - offset)
+        self._set(offset, mask, count, width)
+
+    @staticmethod
+    def index(cell, width):
+        """
+        Returns the index of `cell` on a board of `width` columns.
+        """
+        i, j = cell
+        if not (0 <= j < width and i >= 0):
+            raise ValueError(f"cell {cell} is not on a board {width} wide")
+        return i * width + j
+
+    @classmethod
+    def from_mask(cls, mask, count, width=8, offset=0):
+        """
+        Returns the sentence that `count` of the cells in `mask` are mines,
+        bit k of `mask` being the cell with index `offset + k`.
+        """
+        if mask:
+            low = (mask & -mask).bit_length() - 1
+            mask >>= low
+            offset += low
+        else:
+            offset = 0
+        sentence = object.__new__(cls)
+        sentence._set(offset, mask, count, width)
+        return sentence
+
+    def _set(self, offset, mask, count, width):
+        object.__setattr__(self, "offset", offset)
+        object.__setattr__(self, "mask", mask)
+        object.__setattr__(self, "count", count)
+        object.__setattr__(self, "width", width)
+        object.__setattr__(self, "_hash", hash((offset, mask, count, width)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("sentences are immutable")
 
     def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
+        return (isinstance(other, Sentence) and self.offset == other.offset
+                and self.mask == other.mask and self.count == other.count
+                and self.width == other.width)
+
+    def __hash__(self):
+        return self._hash
+
+    def __le__(self, other):
+        """Returns True if the cells of this sentence are a subset of `other`'s."""
+        if not self.mask:
+            return True
+        shift = self.offset - other.offset
+        if shift < 0:
+            return False
+        return (other.mask >> shift) & self.mask == self.mask
+
+    def __lt__(self, other):
+        return (self.offset, self.mask) != (other.offset, other.mask) and self <= other
+
+    def __sub__(self, other):
+        """
+        Returns the sentence about the cells of this sentence that are not
+        in `other`, assuming `other` is a subset of it.
+        """
+        mask = self.mask
+        if other.mask:
+            mask &= ~(other.mask << (other.offset - self.offset))
+        return Sentence.from_mask(
+            mask, self.count - other.count, self.width, self.offset
+        )
+
+    def __len__(self):
+        return self.mask.bit_count()
 
     def __str__(self):
         return f"{self.cells} = {self.count}"
 
+    @property
+    def cells(self):
+        """
+        The set of cells in the sentence.
+        """
+        return set(divmod(index, self.width) for index in self.indices())
+
+    def indices(self):
+        """
+        Yields the board index of every cell in the sentence, lowest first.
+        """
+        for bit in bits(self.mask):
+            yield self.offset + bit
+
     def known_mines(self):
         """
         Returns the set of all cells in self.cells known to be mines.
         """
-        if len(self.cells) == self.count:
+        if len(self) == self.count:
             return self.cells
         else:
-            return set() 
+            return set()
 
     def known_safes(self):
         """
@@ -117,36 +222,350 @@ class Sentence():
         if self.count == 0:
             return self.cells
         else:
-            return set() 
+            return set()
 
     def mark_mine(self, cell):
         """
-        Updates internal knowledge representation given the fact that
-        a cell is known to be a mine.
+        Returns the sentence that results from knowing that
+        a cell is a mine.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
-            self.count -= 1
+        bit = Sentence.index(cell, self.width) - self.offset
+        if bit >= 0 and self.mask >> bit & 1:
+            return Sentence.from_mask(
+                self.mask & ~(1 << bit), self.count - 1, self.width, self.offset
+            )
+        return self
 
     def mark_safe(self, cell):
         """
-        Updates internal knowledge representation given the fact that
-        a cell is known to be safe.
+        Returns the sentence that results from knowing that
+        a cell is safe.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        bit = Sentence.index(cell, self.width) - self.offset
+        if bit >= 0 and self.mask >> bit & 1:
+            return Sentence.from_mask(
+                self.mask & ~(1 << bit), self.count, self.width, self.offset
+            )
+        return self
+
+
+class SearchTimeout(Exception):
+    """
+    Raised when enumerating mine configurations runs past its deadline.
+    """
+
+
+def log_combinations(n, k):
+    """
+    Returns the natural logarithm of the number of ways to choose `k` of
+    `n` cells, or None if that is impossible.
+    """
+    if k < 0 or k > n:
+        return None
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def constraint_index(sentences):
+    """
+    Orders the cells of `sentences` sentence by sentence, so constraints
+    close early, and returns `(cells, constraints)` where `cells` lists the
+    board index of each cell and `constraints[i]` the indices of the
+    sentences containing `cells[i]`.
+    """
+    cells = []
+    index = dict()
+    for sentence in sorted(sentences, key=len):
+        for bit in sentence.indices():
+            if bit not in index:
+                index[bit] = len(cells)
+                cells.append(bit)
+    constraints = [[] for _ in cells]
+    for c, sentence in enumerate(sentences):
+        for bit in sentence.indices():
+            constraints[index[bit]].append(c)
+    return cells, constraints
+
+
+def count_configurations(sentences, deadline=None, max_cells=None):
+    """
+    Enumerates every assignment of mines to the cells of `sentences` that
+    satisfies all of them.
+
+    Returns a tuple `(cells, totals, counts)` where `cells` lists the board
+    index of each cell, `totals[k]` is the number of assignments placing
+    `k` mines and `counts[k][i]` the number of those in which `cells[i]`
+    is a mine. Returns None if there are more than `max_cells` cells or
+    the `deadline` (a `time.monotonic()` value) passes.
+    """
+    if deadline is not None and time.monotonic() > deadline:
+        return None
+    cells, constraints = constraint_index(sentences)
+    if max_cells is not None and len(cells) > max_cells:
+        return None
+
+    targets = [sentence.count for sentence in sentences]
+    mines = [0] * len(sentences)
+    unassigned = [len(sentence) for sentence in sentences]
+
+    assignment = [0] * len(cells)
+    totals = dict()
+    counts = dict()
+    steps = 0
+
+    def search(i, k):
+        nonlocal steps
+        steps += 1
+        if deadline is not None and steps % 1024 == 0 \
+                and time.monotonic() > deadline:
+            raise SearchTimeout
+        if i == len(cells):
+            totals[k] = totals.get(k, 0) + 1
+            if k not in counts:
+                counts[k] = [0] * len(cells)
+            for j, value in enumerate(assignment):
+                counts[k][j] += value
+            return
+        for value in (0, 1):
+            consistent = True
+            for c in constraints[i]:
+                unassigned[c] -= 1
+                mines[c] += value
+                if mines[c] > targets[c] or mines[c] + unassigned[c] < targets[c]:
+                    consistent = False
+            if consistent:
+                assignment[i] = value
+                search(i + 1, k + value)
+                assignment[i] = 0
+            for c in constraints[i]:
+                unassigned[c] += 1
+                mines[c] -= value
+
+    try:
+        search(0, 0)
+    except SearchTimeout:
+        return None
+    return cells, totals, counts
+
+
+def sample_configurations(sentences, deadline, max_samples=200, block_size=12):
+    """
+    Samples assignments of mines to the cells of `sentences` that satisfy
+    all of them, for components too large to enumerate.
+
+    A first assignment is found by a backtracking search trying values in
+    random order. It is then resampled by block Gibbs sampling: a block of
+    up to `block_size` connected cells is given an assignment chosen
+    uniformly among all those consistent with the rest of the cells. That
+    leaves the uniform distribution over consistent assignments unchanged,
+    so the number of samples with each mine count approximates the number
+    of configurations with it. One sample is taken per sweep over the
+    cells, until there are `max_samples` or the `deadline` (a
+    `time.monotonic()` value) passes.
+
+    Returns the samples in the format of `count_configurations`, with
+    sample frequencies in place of exact counts, or None if no consistent
+    assignment was found in time.
+    """
+    cells, constraints = constraint_index(sentences)
+    targets = [sentence.count for sentence in sentences]
+    members = [[] for _ in sentences]
+    for i, cs in enumerate(constraints):
+        for c in cs:
+            members[c].append(i)
+    neighbours = [
+        sorted(set(j for c in cs for j in members[c]) - {i})
+        for i, cs in enumerate(constraints)
+    ]
+    steps = 0
+
+    def solve(order, need, free, shuffle):
+        """
+        Yields every assignment of values to the cells in `order` that
+        places `need[c]` mines among the `free[c]` cells of sentence `c`.
+        Search is iterative, as components can have thousands of cells.
+        """
+        nonlocal steps
+        need = dict(need)
+        free = dict(free)
+        values = [0] * len(order)
+        options = [None] * len(order)
+        i = 0
+        while i >= 0:
+            if i == len(order):
+                yield list(values)
+                i -= 1
+                continue
+            steps += 1
+            if steps % 1024 == 0 and time.monotonic() > deadline:
+                raise SearchTimeout
+            cell = order[i]
+            if options[i] is None:
+                options[i] = [1, 0] if shuffle and random.random() < 0.5 else [0, 1]
+            else:
+                # Backtracked into this cell: undo its current value
+                for c in constraints[cell]:
+                    free[c] += 1
+                    need[c] += values[i]
+            placed = False
+            while options[i]:
+                value = options[i].pop()
+                consistent = True
+                for c in constraints[cell]:
+                    free[c] -= 1
+                    need[c] -= value
+                    if need[c] < 0 or need[c] > free[c]:
+                        consistent = False
+                if consistent:
+                    values[i] = value
+                    placed = True
+                    break
+                for c in constraints[cell]:
+                    free[c] += 1
+                    need[c] += value
+            if placed:
+                i += 1
+            else:
+                options[i] = None
+                i -= 1
+
+    totals = dict()
+    counts = dict()
+
+    def record(assignment):
+        k = sum(assignment)
+        totals[k] = totals.get(k, 0) + 1
+        if k not in counts:
+            counts[k] = [0] * len(cells)
+        for j, value in enumerate(assignment):
+            counts[k][j] += value
+
+    try:
+        assignment = next(solve(
+            range(len(cells)),
+            dict(enumerate(targets)),
+            {c: len(cs) for c, cs in enumerate(members)},
+            True
+        ), None)
+    except SearchTimeout:
+        return None
+    if assignment is None:
+        return None
+
+    try:
+        while sum(totals.values()) < max_samples:
+            for _ in range(len(cells) // block_size + 1):
+
+                # Grow a block of connected cells from a random cell
+                block = [random.randrange(len(cells))]
+                inside = set(block)
+                for cell in block:
+                    for neighbour in neighbours[cell]:
+                        if len(block) == block_size:
+                            break
+                        if neighbour not in inside:
+                            inside.add(neighbour)
+                            block.append(neighbour)
+
+                # Choose uniformly among the block's consistent assignments
+                touching = set(c for cell in block for c in constraints[cell])
+                need = {c: targets[c] - sum(assignment[j] for j in members[c]
+                                            if j not in inside)
+                        for c in touching}
+                free = {c: sum(1 for j in members[c] if j in inside)
+                        for c in touching}
+                chosen = None
+                for n, values in enumerate(solve(block, need, free, False)):
+                    if random.randrange(n + 1) == 0:
+                        chosen = values
+                for cell, value in zip(block, chosen):
+                    assignment[cell] = value
+
+            record(assignment)
+            if time.monotonic() > deadline:
+                break
+    except SearchTimeout:
+        if not totals:
+            record(assignment)
+
+    return cells, totals, counts
+
+
+class CellSet():
+    """
+    Set of cells that also supports choosing a random member in O(1),
+    by keeping the cells in a list alongside each cell's list position.
+    """
+
+    def __init__(self, cells=()):
+        self.cells = []
+        self.positions = dict()
+        for cell in cells:
+            self.add(cell)
+
+    def __contains__(self, cell):
+        return cell in self.positions
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def add(self, cell):
+        if cell not in self.positions:
+            self.positions[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        """
+        Removes `cell` if present by moving the last cell into its place.
+        """
+        position = self.positions.pop(cell, None)
+        if position is None:
+            return
+        last = self.cells.pop()
+        if position < len(self.cells):
+            self.cells[position] = last
+            self.positions[last] = position
+
+    def choice(self):
+        """
+        Returns a random cell from the set.
+        """
+        return self.cells[random.randrange(len(self.cells))]
+
+
+def bits(mask):
+    """
+    Yields the index of every set bit in `mask`, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 
 class MinesweeperAI():
     """
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None, time_budget=0.2,
+                 max_component_cells=40):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Total number of mines on the board, if known, used to weigh
+        # guesses; and limits on the work done to pick a guess
+        self.total_mines = mines
+        self.time_budget = time_budget
+        self.max_component_cells = max_component_cells
+
+        # Mine configurations of knowledge components from the last guess
+        self.component_cache = dict()
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -154,26 +573,128 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Safe cells in the order they were found, possibly already played,
+        # and cells not yet known to be safe or mines
+        self.safe_queue = collections.deque()
+        self.unknown = CellSet(
+            (i, j) for i in range(height) for j in range(width)
+        )
+
+        # Set of sentences about the game known to be true
+        self.knowledge = set()
+
+        # Map each cell's board index to the sentences that contain it
+        self.cell_index = dict()
+
+        # Sentences added since inference last ran on them
+        self.pending = []
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
+        if cell in self.mines:
+            return
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.unknown.discard(cell)
+        self.rewrite_sentences(cell)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
+        if cell in self.safes:
+            return
         self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self.unknown.discard(cell)
+        if cell not in self.moves_made:
+            self.safe_queue.append(cell)
+        self.rewrite_sentences(cell)
+
+    def rewrite_sentences(self, cell):
+        """
+        Replaces every sentence containing `cell`, now known to be a mine
+        or safe, with one that no longer mentions it.
+        """
+        bit = cell[0] * self.width + cell[1]
+        for sentence in self.cell_index.pop(bit, set()):
+            self.remove_sentence(sentence)
+            self.add_sentence(sentence)
+
+    def add_sentence(self, sentence):
+        """
+        Adds `sentence` to the knowledge base, leaving out cells already
+        known to be mines or safe, and queues it for inference unless it
+        is already known.
+        """
+        mask = sentence.mask
+        mines = 0
+        for bit in bits(sentence.mask):
+            cell = divmod(sentence.offset + bit, self.width)
+            if cell in self.mines:
+                mines += 1
+                mask &= ~(1 << bit)
+            elif cell in self.safes:
+                mask &= ~(1 << bit)
+        if not mask:
+            return
+        if mask != sentence.mask:
+            sentence = Sentence.from_mask(
+                mask, sentence.count - mines, self.width, sentence.offset
+            )
+
+        if sentence in self.knowledge:
+            return
+        self.knowledge.add(sentence)
+        for bit in sentence.indices():
+            self.cell_index.setdefault(bit, set()).add(sentence)
+        self.pending.append(sentence)
+
+    def remove_sentence(self, sentence):
+        """
+        Removes `sentence` from the knowledge base.
+        """
+        self.knowledge.discard(sentence)
+        for bit in sentence.indices():
+            sentences = self.cell_index.get(bit)
+            if sentences is not None:
+                sentences.discard(sentence)
+                if not sentences:
+                    del self.cell_index[bit]
+
+    def infer(self):
+        """
+        Runs inference until no sentence changes: sentences whose cells
+        are all mines or all safe mark those cells, and every sentence
+        that is a subset of an overlapping one yields the difference.
+        Only sentences that were added or changed are examined.
+        """
+        while self.pending:
+            sentence = self.pending.pop()
+            if sentence not in self.knowledge:
+                continue
+
+            known_mines = sentence.known_mines()
+            known_safes = sentence.known_safes()
+            if known_mines or known_safes:
+                for cell in known_mines:
+                    self.mark_mine(cell)
+                for cell in known_safes:
+                    self.mark_safe(cell)
+                continue
+
+            # Only sentences sharing a cell can be subsets or supersets
+            overlapping = set()
+            for bit in sentence.indices():
+                overlapping.update(self.cell_index.get(bit, ()))
+            overlapping.discard(sentence)
+            for other in overlapping:
+                if sentence < other:
+                    self.add_sentence(other - sentence)
+                elif other < sentence:
+                    self.add_sentence(sentence - other)
 
     def add_knowledge(self, cell, count):
         """
@@ -191,13 +712,11 @@ class MinesweeperAI():
                if they can be inferred from existing knowledge
         """
         #1
-        self.moves_made.add(cell) 
+        self.moves_made.add(cell)
         #2
         self.mark_safe(cell)
         #3
-        new_knowledge_cells = set() 
-        
-
+        neighbors = set()
         for i in range(cell[0] - 1, cell[0] + 2):
             for j in range(cell[1] - 1, cell[1] + 2):
 
@@ -205,46 +724,12 @@ class MinesweeperAI():
                 if (i, j) == cell:
                     continue
 
-                # Update count if cell in bounds
                 if 0 <= i < self.height and 0 <= j < self.width:
-                    if (i,j) in self.safes:
-                        continue
-                    if (i,j) in self.mines:
-                        count -= 1
-                        continue
-                    new_knowledge_cells.add((i,j))
-
-        current_sentence = Sentence(new_knowledge_cells, count)
-        self.knowledge.append(current_sentence) 
+                    neighbors.add((i, j))
+        self.add_sentence(Sentence(neighbors, count, self.width))
 
         #4&5
-
-        known_mines_set = set()
-        known_safes_set = set()
-
-        for sentence in self.knowledge:
-            for x in sentence.known_mines():
-                known_mines_set.add(x)
-            for y in sentence.known_safes():
-                known_safes_set.add(y)
-
-        for cell in known_mines_set:
-            self.mark_mine(cell)
-        for cell in known_safes_set:
-            self.mark_safe(cell)
-
-
-        for each in self.knowledge:
-            for every in self.knowledge:
-                if each.cells < every.cells:
-                    # adding new sentences based on inference
-                    new_set = every.cells.difference(each.cells)
-                    new_count = every.count - each.count
-                    new_sentence = Sentence(new_set, new_count)
-
-                    if new_sentence is not None and new_sentence not in self.knowledge:
-                        self.knowledge.append(new_sentence)
-
+        self.infer()
 
     def make_safe_move(self):
         """
@@ -255,28 +740,275 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        for every in self.safes:
-            if every not in self.moves_made:
-                return every
+        # Drop safe cells already played; each is dropped only once
+        while self.safe_queue and self.safe_queue[0] in self.moves_made:
+            self.safe_queue.popleft()
+        if self.safe_queue:
+            return self.safe_queue[0]
         return None
 
     def make_random_move(self):
         """
         Returns a move to make on the Minesweeper board.
-        Should choose randomly among cells that:
+        Should choose among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        picking the cell least likely to be a mine according to
+        `mine_probabilities`, and randomly among equally likely cells.
         """
-        possible_moves = set()
-        for i in range(self.height):
-            for j in range(self.width):
-                possible_moves.add((i,j))
+        safe = self.make_safe_move()
+        if safe is not None:
+            return safe
+
+        risks, interior, interior_risk = self.mine_probabilities()
+        lowest = min(risks.values(), default=1)
+        if interior and interior_risk <= lowest + 1e-12:
+            lowest = interior_risk
+        tied = [cell for cell, risk in risks.items() if risk <= lowest + 1e-12]
+
+        # Choose uniformly among tied frontier cells and interior cells
+        if interior and interior_risk <= lowest + 1e-12:
+            if random.randrange(len(tied) + interior) >= len(tied):
+                return self.interior_cell()
+        if tied:
+            return random.choice(tied)
+        return None
 
-        possible_moves = possible_moves - self.moves_made - self.mines
+    def interior_cell(self):
+        """
+        Returns a random unknown cell that appears in no sentence.
+        """
+        for _ in range(64):
+            cell = self.unknown.choice()
+            if (cell[0] * self.width + cell[1]) not in self.cell_index:
+                return cell
+        return random.choice([
+            cell for cell in self.unknown
+            if (cell[0] * self.width + cell[1]) not in self.cell_index
+        ])
+
+    def components(self):
+        """
+        Splits the knowledge base into groups of sentences that share no
+        cells with any other group, returning a list of lists.
+        """
+        parent = dict()
 
-        if len(possible_moves) > 0:
-            return random.choice(tuple(possible_moves))
-        else:
-            return None
+        def find(bit):
+            while parent[bit] != bit:
+                parent[bit] = parent[parent[bit]]
+                bit = parent[bit]
+            return bit
 
+        for sentence in self.knowledge:
+            cells = list(sentence.indices())
+            for bit in cells:
+                parent.setdefault(bit, bit)
+            root = find(cells[0])
+            for bit in cells[1:]:
+                parent[find(bit)] = root
+
+        groups = dict()
+        for sentence in self.knowledge:
+            root = find(sentence.offset)
+            groups.setdefault(root, []).append(sentence)
+        return list(groups.values())
 
+    def mine_probabilities(self):
+        """
+        Returns a tuple `(risks, interior, interior_risk)`: `risks` maps each
+        cell in the knowledge base to the probability that it is a mine,
+        `interior` is the number of unknown cells in no sentence, and
+        `interior_risk` the probability that any one of those is a mine.
+
+        Each independent component of the knowledge base has its consistent
+        mine configurations enumerated (reusing results from earlier calls),
+        and configurations are weighed by the number of ways to place the
+        remaining mines among unconstrained cells. Components with more than
+        `self.max_component_cells` cells, or too slow to enumerate within
+        `self.time_budget` seconds, are sampled instead in the time left.
+        Sample frequencies only approximate the number of configurations
+        with each mine count, but are weighed the same way, so every cell
+        keeps counting towards the mines left. Components that get no
+        configurations before the budget runs out give each cell the highest
+        mine density among its sentences.
+        """
+        deadline = time.monotonic() + self.time_budget
+        weighed = []
+        large = []
+        cache = dict()
+        for component in self.components():
+            key = frozenset(component)
+            if key in self.component_cache:
+                result = self.component_cache[key]
+            else:
+                result = count_configurations(
+                    component, deadline, self.max_component_cells
+                )
+            if result is None:
+                large.append(component)
+            else:
+                cache[key] = result
+                weighed.append(result)
+
+        # Share the time left between the components to sample. Components
+        # left without any time keep the density estimate below
+        unsampled = []
+        for n, component in enumerate(large):
+            share = (deadline - time.monotonic()) / (len(large) - n)
+            result = None
+            if share > 0:
+                result = sample_configurations(
+                    component, time.monotonic() + share
+                )
+            if result is None:
+                unsampled.append(component)
+            else:
+                cache[frozenset(component)] = result
+                weighed.append(result)
+        self.component_cache = cache
+
+        # Unknown cells in no sentence
+        interior = len(self.unknown) - len(self.cell_index)
+
+        # A component without any configuration found gives each of its
+        # cells the highest mine density among its sentences. Its mine
+        # count is unknown, so the remaining mines are left unknown too
+        probabilities = dict()
+        for component in unsampled:
+            for sentence in component:
+                density = sentence.count / len(sentence)
+                for bit in sentence.indices():
+                    probabilities[bit] = max(probabilities.get(bit, 0), density)
+        remaining = None
+        if self.total_mines is not None and not unsampled:
+            remaining = self.total_mines - len(self.mines)
+        interior_risk = self.weigh_configurations(
+            weighed, interior, remaining, probabilities
+        )
+
+        risks = {
+            divmod(bit, self.width): probability
+            for bit, probability in probabilities.items()
+        }
+        return risks, interior, interior_risk
+
+    def weigh_configurations(self, components, interior, remaining, probabilities):
+        """
+        Adds the mine probability of every cell of the enumerated
+        `components` to `probabilities` (keyed by board index), and returns the
+        probability for each of the `interior` unconstrained cells, given
+        that `remaining` mines are left (None if unknown).
+
+        Configuration counts are products over hundreds of components, too
+        large for floating point, so each component's counts are turned into
+        fractions of its own total. They are also tilted by (p / (1 - p)) ** k
+        for k mines, where p is the overall density of the mines left, which
+        cancels out in the result but keeps the likely total mine counts
+        within floating point range. The distribution of mines in the other
+        components is then built from prefix and suffix passes over the
+        components, instead of convolving all others for each one.
+        """
+        log_tilt = 0
+        if remaining is not None:
+            unknown = interior + sum(len(cells) for cells, _, _ in components)
+            density = min(max(remaining / max(unknown, 1), 1e-6), 1 - 1e-6)
+            log_tilt = math.log(density / (1 - density))
+
+        # Tilted fractions of each component's configurations with
+        # low + x mines, for x in range(len(fractions))
+        lows = []
+        distributions = []
+        for _, totals, _ in components:
+            low = min(totals)
+            logs = np.full(max(totals) - low + 1, -np.inf)
+            for k, n in totals.items():
+                if n:
+                    logs[k - low] = math.log(n) + k * log_tilt
+            fractions = np.exp(logs - logs.max())
+            lows.append(low)
+            distributions.append(fractions / fractions.sum())
+
+        # Ways to place the mines left in the interior, divided by the tilt
+        # and scaled to a maximum of 1, by the number of extra mines in the
+        # components above their lowest counts
+        size = sum(len(fractions) - 1 for fractions in distributions) + 1
+        completions = None
+        if remaining is not None:
+            base = sum(lows)
+            logs = np.full(size, -np.inf)
+            for x in range(size):
+                log = log_combinations(interior, remaining - base - x)
+                if log is not None:
+                    logs[x] = log - (base + x) * log_tilt
+            if np.isfinite(logs).any():
+                completions = np.exp(logs - logs.max())
+
+        # Without a mine count, or if no configuration is consistent with it,
+        # configurations are weighed evenly
+        if completions is None:
+            for (cells, totals, counts), low in zip(components, lows):
+                self.add_cell_probabilities(
+                    probabilities, cells, totals, counts, low,
+                    np.array([totals.get(low + x, 0)
+                              for x in range(max(totals) - low + 1)], dtype=float)
+                )
+            if interior == 0:
+                return 0
+            if remaining is None:
+                # Without a mine count, assume the frontier's average density
+                if not probabilities:
+                    return 0.5
+                return sum(probabilities.values()) / len(probabilities)
+            return min(1, max(0, remaining / interior))
+
+        # Suffix pass: suffixes[c][j] weighs j extra mines in components
+        # before c by the completions of components c onwards
+        suffixes = [None] * (len(components) + 1)
+        suffixes[-1] = completions
+        for c in range(len(components) - 1, -1, -1):
+            suffix = np.correlate(suffixes[c + 1], distributions[c], mode="valid")
+            peak = suffix.max()
+            suffixes[c] = suffix / peak if peak > 0 else suffix
+
+        # Prefix pass: prefix[j] is the distribution of extra mines in the
+        # components before c; a component's mine counts are weighed by
+        # every way the other components and the interior complete them
+        prefix = np.ones(1)
+        for c, (cells, totals, counts) in enumerate(components):
+            weights = distributions[c] * np.correlate(
+                suffixes[c + 1], prefix, mode="valid"
+            )
+            self.add_cell_probabilities(
+                probabilities, cells, totals, counts, lows[c], weights
+            )
+            prefix = np.convolve(prefix, distributions[c])
+
+        if interior == 0:
+            return 0
+
+        # Each interior cell holds (mines left) / (interior cells) of the
+        # mines in every completion
+        weights = prefix * completions
+        if not weights.sum():
+            return min(1, max(0, remaining / interior))
+        left = remaining - sum(lows) - np.arange(size)
+        return float((weights * left).sum() / weights.sum() / interior)
+
+    @staticmethod
+    def add_cell_probabilities(probabilities, cells, totals, counts, low, weights):
+        """
+        Adds to `probabilities` the mine probability of each of `cells`,
+        given the weight of the component holding low + x mines at
+        `weights[x]`.
+        """
+        total = weights.sum()
+        if not total:
+            # Inconsistent with the mine count: weigh configurations evenly
+            weights = np.array([totals.get(low + x, 0)
+                                for x in range(len(weights))], dtype=float)
+            total = weights.sum()
+        scale = [(k, weights[k - low] / total / n)
+                 for k, n in totals.items() if n]
+        for i, bit in enumerate(cells):
+            probabilities[bit] = sum(counts[k][i] * w for k, w in scale)
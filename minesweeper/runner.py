@@ -39,7 +39,7 @@ mine = pygame.transform.scale(mine, (cell_size, cell_size))
 
 # Create game and AI agent
 game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
-ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
+ai = MinesweeperAI(height=HEIGHT, width=WIDTH, mines=MINES)
 
 # Keep track of revealed cells, flagged cells, and if a mine was hit
 revealed = set()
@@ -187,7 +187,7 @@ while True:
                     flags = ai.mines.copy()
                     print("No moves left to make.")
                 else:
-                    print("No known safe moves, AI making random move.")
+                    print("No known safe moves, AI making best guess.")
             else:
                 print("AI making safe move.")
             time.sleep(0.2)
@@ -195,7 +195,7 @@ while True:
         # Reset game state
         elif resetButton.collidepoint(mouse):
             game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
-            ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
+            ai = MinesweeperAI(height=HEIGHT, width=WIDTH, mines=MINES)
             revealed = set()
             flags = set()
             lost = False
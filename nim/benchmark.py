@@ -0,0 +1,34 @@
+import sys
+import time
+
+from nim import train
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [games]")
+    n = int(sys.argv[1]) if len(sys.argv) == 2 else 100000
+
+    # Train with the Q-learning dictionary, without printing progress
+    start = time.perf_counter()
+    ai = train(n, verbose=False)
+    elapsed = time.perf_counter() - start
+    print(f"nim.train: {n} games in {elapsed:.2f}s "
+          f"({n / elapsed:.0f} games/s), {len(ai.q)} Q-values")
+
+    # Train with the vectorized engine, if NumPy is available
+    try:
+        import vectorized
+    except ImportError:
+        return
+    start = time.perf_counter()
+    ai = vectorized.train(n)
+    elapsed = time.perf_counter() - start
+    print(f"vectorized.train: {n} games in {elapsed:.2f}s "
+          f"({n / elapsed:.0f} games/s), {len(ai.q)} Q-values")
+
+
+if __name__ == "__main__":
+    main()
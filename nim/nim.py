@@ -2,6 +2,9 @@ import math
 import random
 import time
 
+# Available actions of every state seen so far, keyed by tuple of piles
+action_cache = dict()
+
 
 class Nim():
 
@@ -25,11 +28,16 @@ class Nim():
 
         Action `(i, j)` represents the action of removing `j` items
         from pile `i` (where piles are 0-indexed).
+
+        Actions are computed once per state and returned as a shared tuple.
         """
-        actions = set()
-        for i, pile in enumerate(piles):
-            for j in range(1, pile + 1):
-                actions.add((i, j))
+        state = tuple(piles)
+        actions = action_cache.get(state)
+        if actions is None:
+            actions = tuple(
+                (i, j) for i, pile in enumerate(piles) for j in range(1, pile + 1)
+            )
+            action_cache[state] = actions
         return actions
 
     @classmethod
@@ -81,8 +89,12 @@ class NimAI():
         pairs to a Q-value (a number).
          - `state` is a tuple of remaining piles, e.g. (1, 1, 4, 4)
          - `action` is a tuple `(i, j)` for an action
+
+        `self.best` maps each state seen so far to its highest Q-value
+        and the action with that value, kept up to date as Q-values change.
         """
         self.q = dict()
+        self.best = dict()
         self.alpha = alpha
         self.epsilon = epsilon
 
@@ -101,10 +113,7 @@ class NimAI():
         Return the Q-value for the state `state` and the action `action`.
         If no Q-value exists yet in `self.q`, return 0.
         """
-        if (tuple(state), action) in self.q:
-            return self.q[(tuple(state), action)] 
-        else:
-            return 0 
+        return self.q.get((tuple(state), action), 0)
 
     def update_q_value(self, state, action, old_q, reward, future_rewards):
         """
@@ -121,7 +130,38 @@ class NimAI():
         `alpha` is the learning rate, and `new value estimate`
         is the sum of the current reward and estimated future rewards.
         """
-        self.q[(tuple(state), action)]= old_q + self.alpha * ((reward + future_rewards) - old_q)
+        state = tuple(state)
+        new_q = old_q + self.alpha * ((reward + future_rewards) - old_q)
+        self.q[(state, action)] = new_q
+
+        #keep the best Q-value of the state current, only rescanning the
+        #state's actions when its best action got worse.
+        best = self.best.get(state)
+        if best is None:
+            return
+        if new_q > best[0]:
+            self.best[state] = (new_q, action)
+        elif action == best[1] and new_q < best[0]:
+            self.best[state] = self.best_action(state, refresh=True)
+
+    def best_action(self, state, refresh=False):
+        """
+        Return the highest Q-value available in `state` and the action
+        with that value, using 0 for pairs with no Q-value, or (0, None)
+        if there are no available actions. The result is cached until
+        the state's Q-values change.
+        """
+        state = tuple(state)
+        if not refresh and state in self.best:
+            return self.best[state]
+
+        best = (0, None)
+        for action in Nim.available_actions(state):
+            test_q = self.q.get((state, action), 0)
+            if best[1] is None or test_q > best[0]:
+                best = (test_q, action)
+        self.best[state] = best
+        return best
 
     def best_future_reward(self, state):
         """
@@ -133,15 +173,7 @@ class NimAI():
         Q-value in `self.q`. If there are no available actions in
         `state`, return 0.
         """
-        set_actions = Nim.available_actions(state)
-        max_q = 0 
-        for action in set_actions:
-            test_q = self.get_q_value(state, action) 
-            if test_q > max_q:
-                max_q = test_q
-
-        return max_q
-
+        return self.best_action(state)[0]
 
     def choose_action(self, state, epsilon=True):
         """
@@ -158,43 +190,24 @@ class NimAI():
         If multiple actions have the same Q-value, any of those
         options is an acceptable return value.
         """
-        set_actions = Nim.available_actions(state)
-
-        if epsilon == False:
-            action_q = (None,0)
-            for action in set_actions:
-                test_action = self.get_q_value(state, action)
-                print(test_action)
-                if test_action > action_q[1] or action_q[0] is None:
-                    action_q = (action, test_action)
-            return action_q[0]
-        elif epsilon == True:
-            decision = ["greedy", "epsilon"]
-            odds = [1 - self.epsilon, self.epsilon]
-            #picking random variable since epsilon is true.
-            path = random.choices(decision, weights= odds, k=1)
-            if path == "greedy":
-                action_q = (None,0)
-                for action in set_actions:
-                    test_action = self.get_q_value(state, action)
-                    if test_action > action_q[1] or action_q[0] is None:
-                        action_q = (action, test_action)
-                return action_q[0]
-            else:
-                choice_list = random.sample(set_actions, 1)
-                return choice_list[0] 
-
-
-def train(n):
+        #with probability epsilon explore a random action, otherwise play the best one.
+        if epsilon and random.random() < self.epsilon:
+            return random.choice(Nim.available_actions(state))
+        return self.best_action(state)[1]
+
+
+def train(n, verbose=True):
     """
     Train an AI by playing `n` games against itself.
+    If `verbose` is False, don't print progress.
     """
 
     player = NimAI()
 
     # Play n games
     for i in range(n):
-        print(f"Playing training game {i + 1}")
+        if verbose:
+            print(f"Playing training game {i + 1}")
         game = Nim()
 
         # Keep track of last move made by either player
@@ -238,7 +251,8 @@ def train(n):
                     0
                 )
 
-    print("Done training")
+    if verbose:
+        print("Done training")
 
     # Return the trained AI
     return player
@@ -0,0 +1,188 @@
+import sys
+import time
+
+import numpy as np
+
+from nim import NimAI
+
+
+class StateSpace():
+    """
+    Dense numbering of every Nim state and action reachable from `initial`
+    """
+
+    def __init__(self, initial=[1, 3, 5, 7]):
+        self.initial = list(initial)
+
+        # States are numbered in mixed radix: pile i is a digit in base
+        # initial[i] + 1, with the first pile as the lowest digit
+        self.radices = [pile + 1 for pile in initial]
+        self.num_states = int(np.prod(self.radices))
+        self.piles = np.zeros((self.num_states, len(initial)), dtype=np.int64)
+        for index in range(self.num_states):
+            self.piles[index] = self.decode(index)
+        self.start = self.encode(initial)
+
+        # Actions (i, j) are numbered pile by pile
+        self.actions = [(i, j) for i, pile in enumerate(initial)
+                        for j in range(1, pile + 1)]
+        self.num_actions = len(self.actions)
+
+        # For every state and action, whether it is legal and the state it
+        # leads to, and for every state its legal actions padded with -1
+        place = np.cumprod([1] + self.radices[:-1])
+        pile_of = np.array([i for i, _ in self.actions])
+        count_of = np.array([j for _, j in self.actions])
+        self.valid = self.piles[:, pile_of] >= count_of
+        self.next = np.where(
+            self.valid,
+            np.arange(self.num_states)[:, None] - count_of * place[pile_of],
+            -1
+        )
+        self.num_valid = self.valid.sum(axis=1)
+        self.legal = np.full((self.num_states, self.num_actions), -1)
+        for index in range(self.num_states):
+            legal = np.flatnonzero(self.valid[index])
+            self.legal[index, :len(legal)] = legal
+
+    def encode(self, piles):
+        """
+        Returns the index of the state with `piles`.
+        """
+        index = 0
+        for pile, radix in zip(reversed(piles), reversed(self.radices)):
+            index = index * radix + pile
+        return index
+
+    def decode(self, index):
+        """
+        Returns the piles of the state numbered `index`.
+        """
+        piles = []
+        for radix in self.radices:
+            index, pile = divmod(index, radix)
+            piles.append(pile)
+        return piles
+
+
+def apply_updates(q, keys, targets, alpha):
+    """
+    Move the entries of the flattened Q-table `q` at `keys` towards
+    `targets` at rate `alpha`, with the same result as applying the
+    updates one after another in order when a key appears more than once.
+    """
+    if len(keys) == 0:
+        return
+    order = np.argsort(keys, kind="stable")
+    keys, targets = keys[order], targets[order]
+
+    # Update k of n to the same key is discounted by (1 - alpha) ** (n - k)
+    unique, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    rank = np.arange(len(keys)) - np.repeat(starts, counts)
+    remaining = np.repeat(counts, counts) - 1 - rank
+    weights = alpha * (1 - alpha) ** remaining
+    totals = np.bincount(np.searchsorted(unique, keys),
+                         weights=weights * targets, minlength=len(unique))
+    q[unique] = (1 - alpha) ** counts * q[unique] + totals
+
+
+def train(n, batch=8192, alpha=0.5, epsilon=0.1, initial=[1, 3, 5, 7], seed=None):
+    """
+    Train an AI by playing `n` games against itself, `batch` games at a
+    time in lockstep, and return it as a `NimAI` with the learned Q-values.
+
+    Moves and rewards follow `nim.train`: a player is rewarded -1 for
+    taking the last object, 1 when the other player does, and 0 when the
+    game goes on.
+    """
+    space = StateSpace(initial)
+    rng = np.random.default_rng(seed)
+    q = np.zeros(space.num_states * space.num_actions)
+    seen = np.zeros(space.num_states * space.num_actions, dtype=bool)
+
+    # State of each game in the batch, with the last state and action of
+    # each player (-1 before their first move)
+    batch = min(batch, n)
+    states = np.full(batch, space.start)
+    players = np.zeros(batch, dtype=np.int64)
+    last_states = np.full((batch, 2), -1)
+    last_actions = np.full((batch, 2), -1)
+    active = np.ones(batch, dtype=bool)
+    started = batch
+    rows = np.arange(batch)
+
+    while active.any():
+        games = rows[active]
+        s = states[games]
+        mover = players[games]
+        other = 1 - mover
+
+        # Epsilon-greedy choice of action for every game
+        table = q.reshape(space.num_states, space.num_actions)
+        values = np.where(space.valid[s], table[s], -np.inf)
+        greedy = values.argmax(axis=1)
+        pick = (rng.random(len(games)) * space.num_valid[s]).astype(np.int64)
+        explore = space.legal[s, pick]
+        actions = np.where(rng.random(len(games)) < epsilon, explore, greedy)
+        new_states = space.next[s, actions]
+        done = new_states == 0
+
+        # Best Q-value available in each new state, 0 if there are none
+        values = np.where(space.valid[new_states], table[new_states], -np.inf)
+        best_future = values.max(axis=1)
+        best_future[done] = 0
+
+        # The mover loses by taking the last object; the other player's
+        # last move is rewarded with the outcome, or 0 if the game goes on
+        previous_states = last_states[games, other]
+        previous_actions = last_actions[games, other]
+        previous = previous_states >= 0
+        keys = np.concatenate([
+            s[done] * space.num_actions + actions[done],
+            previous_states[previous] * space.num_actions + previous_actions[previous],
+        ])
+        targets = np.concatenate([
+            np.full(done.sum(), -1.0),
+            np.where(done, 1.0, best_future)[previous],
+        ])
+        apply_updates(q, keys, targets, alpha)
+        seen[keys] = True
+
+        # Advance games, starting new ones in place of those finished
+        last_states[games, mover] = s
+        last_actions[games, mover] = actions
+        states[games] = new_states
+        players[games] = other
+        finished = games[done]
+        restart = finished[:max(0, n - started)]
+        started += len(restart)
+        active[finished[len(restart):]] = False
+        states[restart] = space.start
+        players[restart] = 0
+        last_states[restart] = -1
+        last_actions[restart] = -1
+
+    # Export the Q-values of every pair updated during training
+    player = NimAI(alpha=alpha, epsilon=epsilon)
+    for key in np.flatnonzero(seen):
+        index, action = divmod(int(key), space.num_actions)
+        player.q[(tuple(space.decode(index)), space.actions[action])] = float(q[key])
+    return player
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python vectorized.py [games]")
+    n = int(sys.argv[1]) if len(sys.argv) == 2 else 1000000
+
+    start = time.perf_counter()
+    ai = train(n)
+    elapsed = time.perf_counter() - start
+    print(f"Trained {n} games in {elapsed:.2f}s ({n / elapsed:.0f} games/s), "
+          f"{len(ai.q)} Q-values")
+
+
+if __name__ == "__main__":
+    main()
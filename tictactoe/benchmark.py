@@ -0,0 +1,113 @@
+import time
+
+import tictactoe as ttt
+from tictactoe import X, O, EMPTY
+
+# Positions to search, with X or O to move
+POSITIONS = {
+    "initial": ttt.initial_state(),
+    "center opening": [[EMPTY, EMPTY, EMPTY],
+                       [EMPTY, X, EMPTY],
+                       [EMPTY, EMPTY, EMPTY]],
+    "edge reply": [[EMPTY, O, EMPTY],
+                   [EMPTY, X, EMPTY],
+                   [EMPTY, EMPTY, EMPTY]],
+    "fork threat": [[X, EMPTY, EMPTY],
+                    [EMPTY, O, EMPTY],
+                    [EMPTY, EMPTY, X]],
+    "late game": [[X, O, X],
+                  [EMPTY, O, EMPTY],
+                  [EMPTY, X, EMPTY]],
+}
+
+
+def full_minimax(board):
+    """
+    Return the value of the board and the number of nodes visited by a
+    minimax search without pruning or a transposition table.
+    """
+    if ttt.terminal(board):
+        return ttt.utility(board), 1
+    values = []
+    nodes = 1
+    for action in ttt.actions(board):
+        v, n = full_minimax(ttt.result(board, action))
+        values.append(v)
+        nodes += n
+    if ttt.player(board) == X:
+        return max(values), nodes
+    return min(values), nodes
+
+
+def full_bitboard_minimax(x, o):
+    """
+    Return the value of the (x, o) bitboard and the number of nodes visited
+    by a minimax search without pruning or a transposition table.
+    """
+    if ttt.bitboard_terminal(x, o):
+        return ttt.bitboard_utility(x, o), 1
+    values = []
+    nodes = 1
+    for cell in ttt.bitboard_actions(x, o):
+        v, n = full_bitboard_minimax(*ttt.bitboard_result(x, o, cell))
+        values.append(v)
+        nodes += n
+    if ttt.bitboard_player(x, o) == X:
+        return max(values), nodes
+    return min(values), nodes
+
+
+def timed(function, *args):
+    """
+    Return the result of calling `function` and the time taken in seconds.
+    """
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def search(board, **options):
+    """
+    Return the move chosen by `ttt.minimax` with an empty transposition
+    table, the number of nodes it searched and the time taken in seconds.
+    """
+    ttt.clear_table()
+    start = time.perf_counter()
+    move = ttt.minimax(board, use_book=False, **options)
+    elapsed = time.perf_counter() - start
+    return move, ttt.table_stats()["nodes"], elapsed
+
+
+def main():
+    searches = [
+        ("alpha-beta", dict(ordered=False)),
+        ("ordered", dict(ordered=True)),
+        ("iterative", dict(ordered=True, iterative=True)),
+    ]
+
+    # Nodes searched by each search from an empty table
+    print("Nodes searched")
+    print(f"{'position':<16}{'minimax':>10}"
+          + "".join(f"{name:>12}" for name, _ in searches) + "   move")
+    full_times = []
+    for name, board in POSITIONS.items():
+        (_, full_nodes), list_time = timed(full_minimax, board)
+        _, bitboard_time = timed(full_bitboard_minimax, *ttt.to_bitboard(board))
+        full_times.append((name, list_time, bitboard_time))
+        counts = []
+        for _, options in searches:
+            move, nodes, _ = search(board, **options)
+            counts.append(nodes)
+        print(f"{name:<16}{full_nodes:>10}"
+              + "".join(f"{nodes:>12}" for nodes in counts) + f"   {move}")
+
+    # Time for minimax over the whole game tree without pruning
+    print()
+    print("Full tree search time (s)")
+    print(f"{'position':<16}{'lists':>10}{'bitboards':>12}")
+    for name, list_time, bitboard_time in full_times:
+        print(f"{name:<16}{list_time:>10.3f}{bitboard_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
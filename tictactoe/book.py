@@ -0,0 +1,82 @@
+import sys
+import time
+
+import tictactoe as ttt
+
+
+def reachable():
+    """
+    Return every bitboard (x, o) that can come up in a game, starting from
+    the empty board.
+    """
+    boards = {(0, 0)}
+    frontier = [(0, 0)]
+    while frontier:
+        x, o = frontier.pop()
+        if ttt.bitboard_terminal(x, o):
+            continue
+        for cell in ttt.bitboard_actions(x, o):
+            child = ttt.bitboard_result(x, o, cell)
+            if child not in boards:
+                boards.add(child)
+                frontier.append(child)
+    return boards
+
+
+def build(filename):
+    """
+    Solve every reachable board with a live search and write the opening
+    book to `filename`. Return the number of boards in the book.
+    """
+    book = bytearray([ttt.UNREACHABLE] * ttt.BOOK_SIZE)
+    boards = reachable()
+    for x, o in boards:
+        board = ttt.from_bitboard(x, o)
+        move = ttt.minimax(board, use_book=False)
+        cell = ttt.NO_MOVE if move is None else ttt.CELLS.index(move)
+        book[ttt.TERNARY[x] + 2 * ttt.TERNARY[o]] = (ttt.value(board) + 1) << 4 | cell
+    with open(filename, "wb") as f:
+        f.write(book)
+    return len(boards)
+
+
+def verify(filename):
+    """
+    Check the opening book in `filename` against a live search of every
+    reachable board. Return the list of boards where they disagree.
+    """
+    ttt.load_book(filename)
+    mismatches = []
+    for x, o in reachable():
+        board = ttt.from_bitboard(x, o)
+        move = ttt.minimax(board, use_book=False)
+        expected = (None if move is None else ttt.CELLS.index(move), ttt.value(board))
+        if ttt.book_entry(x, o) != expected:
+            mismatches.append(board)
+    return mismatches
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) not in [2, 3] or sys.argv[1] not in ["build", "verify"]:
+        sys.exit("Usage: python book.py build|verify [book]")
+    filename = sys.argv[2] if len(sys.argv) == 3 else ttt.BOOK_FILE
+
+    start = time.perf_counter()
+    if sys.argv[1] == "build":
+        count = build(filename)
+        print(f"Wrote {count} boards to {filename} "
+              f"in {time.perf_counter() - start:.2f}s")
+    else:
+        mismatches = verify(filename)
+        for board in mismatches:
+            print(f"Book disagrees with search on {board}")
+        print(f"{len(mismatches)} mismatches "
+              f"in {time.perf_counter() - start:.2f}s")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Monte Carlo Tree Search player for any game exposing the same functions
+as `tictactoe`: player, actions, result, terminal and utility.
+"""
+
+import importlib
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+import tictactoe as ttt
+
+
+class Node():
+    """
+    Node of the search tree: a board, reached by `action` from its parent
+    """
+
+    __slots__ = ("board", "parent", "action", "mover", "children",
+                 "untried", "visits", "reward")
+
+    def __init__(self, game, board, parent=None, action=None):
+        self.board = board
+        self.parent = parent
+        self.action = action
+
+        # Player who made the move into this node, whose reward it tracks
+        self.mover = None if parent is None else game.player(parent.board)
+        self.children = []
+        self.untried = [] if game.terminal(board) else list(game.actions(board))
+        self.visits = 0
+        self.reward = 0.0
+
+    def select(self, exploration):
+        """
+        Returns the child with the highest upper confidence bound (UCT).
+        """
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.reward / child.visits
+            + exploration * math.sqrt(log_visits / child.visits)
+        )
+
+
+def reward(game, board, player):
+    """
+    Returns 1 if `player` has won the finished game on the board, 0 if they
+    have lost and 0.5 for a tie.
+    """
+    utility = game.utility(board)
+    if player == ttt.X:
+        return (utility + 1) / 2
+    return (1 - utility) / 2
+
+
+def search(board, iterations=1000, time_limit=None, exploration=math.sqrt(2),
+           seed=None, game_name="tictactoe"):
+    """
+    Grow a search tree from the board for `iterations` playouts, or until
+    `time_limit` seconds have passed if given, and return a dictionary
+    mapping each action at the root to its visit count and total reward.
+    `game_name` is the module providing the game's functions.
+    """
+    game = importlib.import_module(game_name)
+    rng = random.Random(seed)
+    root = Node(game, board)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    iteration = 0
+    while iteration < iterations or deadline is not None:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        iteration += 1
+
+        # Selection: descend through fully expanded nodes
+        node = root
+        while not node.untried and node.children:
+            node = node.select(exploration)
+
+        # Expansion: add one untried action
+        if node.untried:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            child = Node(game, game.result(node.board, action), node, action)
+            node.children.append(child)
+            node = child
+
+        # Simulation: play random moves to the end of the game
+        board = node.board
+        while not game.terminal(board):
+            board = game.result(board, rng.choice(game.actions(board)))
+
+        # Backpropagation: credit each node's mover with the outcome
+        while node is not None:
+            node.visits += 1
+            if node.mover is not None:
+                node.reward += reward(game, board, node.mover)
+            node = node.parent
+
+    return {child.action: (child.visits, child.reward) for child in root.children}
+
+
+class MCTSPlayer():
+    """
+    Plays by Monte Carlo Tree Search with UCT selection. With more than one
+    process, independent trees are grown from the root in parallel and
+    their visit counts added up (root parallelisation).
+    """
+
+    def __init__(self, iterations=1000, time_limit=None, processes=1,
+                 exploration=math.sqrt(2), seed=None, game=ttt):
+        """
+        Each move runs `iterations` playouts in total, or searches for
+        `time_limit` seconds if given, split over `processes` processes.
+        """
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.processes = processes
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.game = game
+        self.pool = None
+
+        # Playouts run for the last move
+        self.playouts = 0
+
+    def choose_action(self, board):
+        """
+        Returns the most visited action at the root for the board, or None
+        if the game is over.
+        """
+        if self.game.terminal(board):
+            return None
+
+        seeds = [self.rng.getrandbits(32) for _ in range(self.processes)]
+        iterations = math.ceil(self.iterations / self.processes)
+        arguments = [(board, iterations, self.time_limit, self.exploration,
+                      seed, self.game.__name__) for seed in seeds]
+        if self.processes == 1:
+            results = [search(*arguments[0])]
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.processes)
+            results = self.pool.starmap(search, arguments)
+
+        visits = dict()
+        for result in results:
+            for action, (count, _) in result.items():
+                visits[action] = visits.get(action, 0) + count
+        self.playouts = sum(visits.values())
+        return max(visits, key=visits.get)
+
+    def close(self):
+        """
+        Shuts down the worker processes, if any were started.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+
+def play(mcts, mcts_player):
+    """
+    Play one game of the MCTS player as `mcts_player` against minimax.
+    Return the winner and, for each player, the number of moves made and
+    the time spent choosing them in seconds.
+    """
+    board = ttt.initial_state()
+    moves = {"mcts": [0, 0.0], "minimax": [0, 0.0]}
+    while not ttt.terminal(board):
+        name = "mcts" if ttt.player(board) == mcts_player else "minimax"
+        start = time.perf_counter()
+        if name == "mcts":
+            action = mcts.choose_action(board)
+        else:
+            action = ttt.minimax(board)
+        moves[name][0] += 1
+        moves[name][1] += time.perf_counter() - start
+        board = ttt.result(board, action)
+    return ttt.winner(board), moves
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python mcts.py [games] [iterations] [processes]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    # Play MCTS against minimax, taking turns to go first
+    mcts = MCTSPlayer(iterations=iterations, processes=processes, seed=0)
+    wins = draws = losses = 0
+    totals = {"mcts": [0, 0.0], "minimax": [0, 0.0]}
+    try:
+        for i in range(games):
+            mcts_player = ttt.X if i % 2 == 0 else ttt.O
+            winner, moves = play(mcts, mcts_player)
+            if winner == mcts_player:
+                wins += 1
+            elif winner is None:
+                draws += 1
+            else:
+                losses += 1
+            for name in totals:
+                totals[name][0] += moves[name][0]
+                totals[name][1] += moves[name][1]
+    finally:
+        mcts.close()
+
+    print(f"MCTS ({iterations} playouts, {processes} processes) "
+          f"vs minimax over {games} games")
+    print(f"MCTS wins: {wins / games:.1%}, draws: {draws / games:.1%}, "
+          f"losses: {losses / games:.1%}")
+    for name, (count, seconds) in totals.items():
+        print(f"{name}: {count / seconds:.1f} moves/s")
+
+
+if __name__ == "__main__":
+    main()
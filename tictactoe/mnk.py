@@ -0,0 +1,431 @@
+"""
+m,n,k-game engine: tic-tac-toe on a board of any size where a player needs
+k of their marks in a row to win, such as 4x4 tic-tac-toe or gomoku.
+"""
+
+import random
+import sys
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Directions a line of marks can run in: across, down and both diagonals
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+# Score of a won game. Wins found by the search score WIN minus the number
+# of moves until the win, so anything above MATE is a forced result
+WIN = 1000000
+MATE = WIN - 1000
+
+# Empty cells within this many rows and columns of a mark are searched
+RADIUS = 2
+
+
+class SearchTimeout(Exception):
+    """
+    Raised when a search runs past its deadline.
+    """
+
+
+class Game():
+    """
+    m,n,k-game representation
+    """
+
+    def __init__(self, height=3, width=3, k=3):
+
+        # Set initial width, height, and win length
+        self.height = height
+        self.width = width
+        self.k = k
+        self.size = height * width
+
+        # Cells are stored in a flat list, row by row
+        self.cells = [EMPTY] * self.size
+        self.history = []
+        self.winner = None
+        self.winners = []
+
+        # Every line of k cells that could win the game, and the lines
+        # passing through each cell
+        self.windows = []
+        self.windows_through = [[] for _ in range(self.size)]
+        for i in range(height):
+            for j in range(width):
+                for di, dj in DIRECTIONS:
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < height and 0 <= end_j < width:
+                        window = [(i + di * n) * width + j + dj * n
+                                  for n in range(k)]
+                        for cell in window:
+                            self.windows_through[cell].append(len(self.windows))
+                        self.windows.append(window)
+
+        # Marks of each player in every window, windows one mark away from
+        # a win, and the evaluation of the board for X, kept up to date
+        # as marks are placed and removed
+        self.counts = {X: [0] * len(self.windows), O: [0] * len(self.windows)}
+        self.threats = {X: set(), O: set()}
+        self.score = 0
+        self.weights = [0] + [4 ** n for n in range(1, k + 1)]
+
+        # Number of marks near each cell
+        self.near = [0] * self.size
+        self.neighbours = [
+            [ni * width + nj
+             for ni in range(max(0, i - RADIUS), min(height, i + RADIUS + 1))
+             for nj in range(max(0, j - RADIUS), min(width, j + RADIUS + 1))]
+            for i in range(height) for j in range(width)
+        ]
+
+        # Random keys for Zobrist hashing of positions
+        rng = random.Random(0)
+        self.keys = {X: [rng.getrandbits(64) for _ in range(self.size)],
+                     O: [rng.getrandbits(64) for _ in range(self.size)]}
+        self.hash = 0
+
+    @classmethod
+    def from_board(cls, board, k=3):
+        """
+        Returns the game on a list of lists board like those in `tictactoe`.
+        """
+        game = cls(len(board), len(board[0]), k)
+        for i, row in enumerate(board):
+            for j, mark in enumerate(row):
+                if mark != EMPTY:
+                    game.place(i * game.width + j, mark)
+        return game
+
+    def board(self):
+        """
+        Returns the board as a list of lists, as used by `tictactoe`.
+        """
+        return [self.cells[i * self.width:(i + 1) * self.width]
+                for i in range(self.height)]
+
+    def player(self):
+        """
+        Returns player who has the next turn.
+        """
+        return X if len(self.history) % 2 == 0 else O
+
+    def actions(self):
+        """
+        Returns all possible actions (i, j) available on the board.
+        """
+        return [divmod(cell, self.width)
+                for cell in range(self.size) if self.cells[cell] == EMPTY]
+
+    def terminal(self):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner is not None or len(self.history) == self.size
+
+    def utility(self):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        return {X: 1, O: -1, None: 0}[self.winner]
+
+    def move(self, action):
+        """
+        Makes move (i, j) for the current player.
+        """
+        i, j = action
+        if not (0 <= i < self.height and 0 <= j < self.width):
+            raise Exception("that move is off the board.")
+        cell = i * self.width + j
+        if self.terminal() or self.cells[cell] != EMPTY:
+            raise Exception("that move is illegal given the board state. ")
+        self.place(cell, self.player())
+
+    def place(self, cell, mark):
+        """
+        Puts `mark` in `cell`, updating the window counts, threats, score
+        and winner.
+        """
+        other = O if mark == X else X
+        sign = 1 if mark == X else -1
+        for w in self.windows_through[cell]:
+            mine, theirs = self.counts[mark][w], self.counts[other][w]
+            if theirs == 0:
+                self.score += sign * (self.weights[mine + 1] - self.weights[mine])
+                if mine + 1 == self.k - 1:
+                    self.threats[mark].add(w)
+                elif mine + 1 == self.k:
+                    self.threats[mark].discard(w)
+            elif mine == 0:
+                self.score += sign * self.weights[theirs]
+                if theirs == self.k - 1:
+                    self.threats[other].discard(w)
+            self.counts[mark][w] = mine + 1
+
+        self.cells[cell] = mark
+        self.history.append(cell)
+        self.winners.append(self.winner)
+        self.hash ^= self.keys[mark][cell]
+        for neighbour in self.neighbours[cell]:
+            self.near[neighbour] += 1
+        if self.winner is None and self.wins(cell):
+            self.winner = mark
+
+    def undo(self):
+        """
+        Takes back the last mark placed.
+        """
+        cell = self.history.pop()
+        mark = self.cells[cell]
+        other = O if mark == X else X
+        sign = 1 if mark == X else -1
+        for w in self.windows_through[cell]:
+            mine, theirs = self.counts[mark][w] - 1, self.counts[other][w]
+            if theirs == 0:
+                self.score -= sign * (self.weights[mine + 1] - self.weights[mine])
+                if mine + 1 == self.k - 1:
+                    self.threats[mark].discard(w)
+                elif mine + 1 == self.k:
+                    self.threats[mark].add(w)
+            elif mine == 0:
+                self.score -= sign * self.weights[theirs]
+                if theirs == self.k - 1:
+                    self.threats[other].add(w)
+            self.counts[mark][w] = mine
+
+        self.cells[cell] = EMPTY
+        self.hash ^= self.keys[mark][cell]
+        for neighbour in self.neighbours[cell]:
+            self.near[neighbour] -= 1
+        self.winner = self.winners.pop()
+
+    def wins(self, cell):
+        """
+        Returns True if the mark in `cell` is part of k in a row. Only the
+        lines through `cell` are checked.
+        """
+        mark = self.cells[cell]
+        i, j = divmod(cell, self.width)
+        for di, dj in DIRECTIONS:
+            length = 1
+            for step in (1, -1):
+                ni, nj = i + di * step, j + dj * step
+                while (0 <= ni < self.height and 0 <= nj < self.width
+                       and self.cells[ni * self.width + nj] == mark):
+                    length += 1
+                    ni, nj = ni + di * step, nj + dj * step
+            if length >= self.k:
+                return True
+        return False
+
+    def threat_cells(self, mark):
+        """
+        Returns the set of empty cells that would complete k in a row for `mark`.
+        """
+        return {cell for w in self.threats[mark] for cell in self.windows[w]
+                if self.cells[cell] == EMPTY}
+
+
+class MNKAI():
+    """
+    Player for m,n,k-games using iterative deepening alpha-beta search.
+
+    Positions past the depth limit are scored by counting, for every line
+    of k cells, the marks of a player who could still win along it, with
+    each extra mark worth four times the last. Lines one mark away from a
+    win are threats: a player to move with a threat wins, and a player
+    facing two threats they cannot both block loses.
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=None, breadth=None):
+        """
+        Search for at most `time_limit` seconds per move and, if given,
+        at most `max_depth` moves ahead, trying only the `breadth` most
+        promising moves in each position.
+        """
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.breadth = breadth
+        self.table = dict()
+
+        # Statistics about the last search
+        self.nodes = 0
+        self.depth = 0
+        self.value = 0
+
+    def choose_action(self, game):
+        """
+        Returns the best action (i, j) for the current player in `game`,
+        or None if the game is over. A move that completes a full-depth
+        search is optimal, so small boards like 3x3 are played perfectly.
+        """
+        if game.terminal():
+            return None
+
+        self.table.clear()
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.time_limit
+        empty = game.size - len(game.history)
+        max_depth = empty if self.max_depth is None else min(self.max_depth, empty)
+
+        # Search one move deeper at a time, keeping the last complete result
+        best_cell = self.moves(game, None)[0]
+        for depth in range(1, max_depth + 1):
+            try:
+                self.value, best_cell = self.search_root(game, depth, best_cell)
+            except SearchTimeout:
+                break
+            self.depth = depth
+            if abs(self.value) > MATE:
+                break
+
+        return divmod(best_cell, game.width)
+
+    def search_root(self, game, depth, first):
+        """
+        Returns the value and best cell for the current player searched
+        `depth` moves ahead, trying `first` before the other moves.
+        """
+        moves = self.moves(game, first)
+        alpha, beta = -WIN - 1, WIN + 1
+        best_cell = moves[0]
+        for cell in moves:
+            game.place(cell, game.player())
+            try:
+                v = self.score(-self.negamax(game, depth - 1, -beta, -alpha))
+            finally:
+                game.undo()
+            if v > alpha:
+                alpha, best_cell = v, cell
+        return alpha, best_cell
+
+    @staticmethod
+    def score(v):
+        """
+        Returns child value `v` seen from its parent, one move further from
+        any forced result.
+        """
+        if v > MATE:
+            return v - 1
+        if v < -MATE:
+            return v + 1
+        return v
+
+    def negamax(self, game, depth, alpha, beta):
+        """
+        Returns the value of `game` for the player to move, searched `depth`
+        moves ahead. If the value is at most `alpha` or at least `beta` only
+        that bound is guaranteed.
+        """
+        self.nodes += 1
+        if self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        # The player who just moved has won, or the board is full
+        if game.winner is not None:
+            return -WIN
+        if len(game.history) == game.size:
+            return 0
+
+        # A threat wins next move; two threats that can't be blocked lose
+        player = game.player()
+        other = O if player == X else X
+        if game.threats[player]:
+            return WIN - 1
+        blocks = game.threat_cells(other)
+        if len(blocks) > 1:
+            return -(WIN - 2)
+
+        if depth == 0:
+            return game.score if player == X else -game.score
+
+        entry = self.table.get(game.hash)
+        best_cell = None
+        if entry is not None:
+            entry_depth, v, bound, best_cell = entry
+            if entry_depth >= depth and (
+                bound == 0 or (bound > 0 and v >= beta) or (bound < 0 and v <= alpha)
+            ):
+                return v
+
+        # A single threat has to be blocked
+        moves = list(blocks) if blocks else self.moves(game, best_cell)
+
+        original_alpha = alpha
+        best = -WIN - 1
+        for cell in moves:
+            game.place(cell, player)
+            try:
+                v = self.score(-self.negamax(game, depth - 1, -beta, -alpha))
+            finally:
+                game.undo()
+            if v > best:
+                best, best_cell = v, cell
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            bound = -1
+        elif best >= beta:
+            bound = 1
+        else:
+            bound = 0
+        self.table[game.hash] = (depth, best, bound, best_cell)
+        return best
+
+    def moves(self, game, first):
+        """
+        Returns the empty cells near existing marks, most promising first,
+        with `first` ahead of the rest. Cells are ranked by how much they
+        add to lines either player could still complete.
+        """
+        if not game.history:
+            return [(game.height // 2) * game.width + game.width // 2]
+
+        def promise(cell):
+            total = 0
+            for w in game.windows_through[cell]:
+                xs, os = game.counts[X][w], game.counts[O][w]
+                if os == 0:
+                    total += game.weights[xs + 1]
+                if xs == 0:
+                    total += game.weights[os + 1]
+            return total
+
+        moves = [cell for cell in range(game.size)
+                 if game.cells[cell] == EMPTY and game.near[cell]]
+        moves.sort(key=promise, reverse=True)
+        if self.breadth is not None:
+            moves = moves[:self.breadth]
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        elif first is not None and game.cells[first] == EMPTY:
+            moves.insert(0, first)
+        return moves
+
+
+def main():
+
+    # Check usage
+    if len(sys.argv) not in [1, 4, 5]:
+        sys.exit("Usage: python mnk.py [height width k [seconds]]")
+
+    # Play the AI against itself, printing each move
+    height, width, k = (int(arg) for arg in sys.argv[1:4]) if len(sys.argv) > 1 else (3, 3, 3)
+    time_limit = float(sys.argv[4]) if len(sys.argv) == 5 else 1.0
+    game = Game(height, width, k)
+    ai = MNKAI(time_limit=time_limit)
+    while not game.terminal():
+        start = time.perf_counter()
+        action = ai.choose_action(game)
+        print(f"{game.player()} plays {action}: depth {ai.depth}, "
+              f"{ai.nodes} nodes in {time.perf_counter() - start:.2f}s")
+        game.move(action)
+    for row in game.board():
+        print(" ".join(mark or "." for mark in row))
+    print(f"Winner: {game.winner}" if game.winner else "Tie")
+
+
+if __name__ == "__main__":
+    main()
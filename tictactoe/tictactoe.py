@@ -3,12 +3,28 @@ Tic Tac Toe Player
 """
 
 import math
-import copy
+import os
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Boards are searched as bitboards: a pair of 9-bit masks (x, o) holding
+# the cells taken by each player, with cell (i, j) at bit 3 * i + j
+CELLS = [(i, j) for i in range(3) for j in range(3)]
+FULL = (1 << 9) - 1
+
+# The 8 lines of three cells that win the game
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+]
+
+# Number of cells and whether there is a winning line in each mask
+POPCOUNT = [bin(mask).count("1") for mask in range(1 << 9)]
+WINS = [any(mask & line == line for line in WIN_MASKS) for mask in range(1 << 9)]
+
 
 def initial_state():
     """
@@ -19,141 +35,372 @@ def initial_state():
             [EMPTY, EMPTY, EMPTY]]
 
 
+def to_bitboard(board):
+    """
+    Returns the (x, o) masks of the cells taken by each player on the board.
+    """
+    x = o = 0
+    for cell, (i, j) in enumerate(CELLS):
+        if board[i][j] == X:
+            x |= 1 << cell
+        elif board[i][j] == O:
+            o |= 1 << cell
+    return x, o
+
+
+def from_bitboard(x, o):
+    """
+    Returns the list of lists board with the cells in the (x, o) masks taken.
+    """
+    board = initial_state()
+    for cell, (i, j) in enumerate(CELLS):
+        if x >> cell & 1:
+            board[i][j] = X
+        elif o >> cell & 1:
+            board[i][j] = O
+    return board
+
+
+def bitboard_player(x, o):
+    """
+    Returns player who has the next turn on a bitboard.
+    """
+    #X moves whenever both players have taken the same number of cells.
+    return X if POPCOUNT[x] == POPCOUNT[o] else O
+
+
+def bitboard_actions(x, o):
+    """
+    Returns the list of empty cells on a bitboard as bit indices.
+    """
+    taken = x | o
+    return [cell for cell in range(9) if not taken >> cell & 1]
+
+
+def bitboard_result(x, o, cell):
+    """
+    Returns the bitboard that results from the current player taking `cell`.
+    """
+    if (x | o) >> cell & 1:
+        raise Exception("that move is illegal given the board state. ")
+    if POPCOUNT[x] == POPCOUNT[o]:
+        return x | 1 << cell, o
+    return x, o | 1 << cell
+
+
+def bitboard_winner(x, o):
+    """
+    Returns the winner of the game on a bitboard, if there is one.
+    """
+    if WINS[x]:
+        return X
+    if WINS[o]:
+        return O
+    return None
+
+
+def bitboard_terminal(x, o):
+    """
+    Returns True if the game on a bitboard is over, False otherwise.
+    """
+    return WINS[x] or WINS[o] or x | o == FULL
+
+
+def bitboard_utility(x, o):
+    """
+    Returns 1 if X has won the game on a bitboard, -1 if O has won, 0 otherwise.
+    """
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    return 0
+
+
 def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    x_count = 0;
-    o_count = 0;
-    for every in board:
-        for each in every:
-            if each == "X":
-                x_count += 1
-            if each == "O":
-                o_count += 1
-
-    #using remainder to find out which player gets to play next.
-    if (x_count + o_count)%2 != 0:
-        return O
-    if (x_count + o_count)%2 != 1:
-        return X
-    else:
-        print("something went wrong in the player function")
+    return bitboard_player(*to_bitboard(board))
 
 
 def actions(board):
     """
     Returns set of all possible actions (i, j) available on the board.
     """
-    actions_set = []
-    row_counter = -1
-    column_counter = -1
-    for every in board:
-        row_counter += 1
-        for each in every:
-            column_counter += 1
-            if each == None:
-                actions_set.append((row_counter, column_counter))
-        column_counter = -1
-    row_counter =  -1
-
-    return actions_set
-
+    return [(i, j) for i, j in CELLS if board[i][j] == EMPTY]
 
 
 def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    board_deep_copy = copy.deepcopy(board)
-        
     if board[action[0]][action[1]] != None:
         raise Exception("that move is illegal given the board state. ")
 
-    board_deep_copy[action[0]][action[1]] = player(board) 
+    #only the rows are copied, the cells themselves are immutable strings
+    new_board = [list(row) for row in board]
+    new_board[action[0]][action[1]] = player(board)
+    return new_board
 
-    return board_deep_copy
 
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    #checks for winner on horizontal
-    for every in board:
-        value_board = every[0]
-        if every == [value_board, value_board, value_board]:
-            return value_board
-    #checks for winner on vertical
-    for each in [0,1,2]: 
-        if board[0][each] == board[1][each] == board[2][each]:
-            return board[0][each]
-        
-    #checks for winner on diagonal
-    if board[0][0] == board[1][1] == board[2][2]:
-        return board[0][0]
-    if board[0][2] == board[1][1] == board[2][0]:
-        return board[0][2]
+    return bitboard_winner(*to_bitboard(board))
 
-    return None
-         
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if actions(board) == [] or winner(board) != None:
-        return True
-    else: 
-        return False
+    return bitboard_terminal(*to_bitboard(board))
+
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    if winner(board) == X:
-        return 1
-    if winner(board) == O:
-        return -1
-    if winner(board) == None:
+    return bitboard_utility(*to_bitboard(board))
+
+
+# Opening book of the best move and value of every reachable board, built
+# by book.py and loaded the first time minimax needs it. Each board has one
+# byte at its base 3 index: the value plus one in the high bits and the
+# cell of the best move (NO_MOVE for finished games) in the low four bits
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+BOOK_SIZE = 3 ** 9
+UNREACHABLE = 0xFF
+NO_MOVE = 0xF
+opening_book = None
+
+# Base 3 digits of each mask, so a board's index is TERNARY[x] + 2 * TERNARY[o]
+TERNARY = [sum(3 ** cell for cell in range(9) if mask >> cell & 1)
+           for mask in range(1 << 9)]
+
+
+def load_book(filename=BOOK_FILE):
+    """
+    Loads the opening book from `filename`. Without a book file, minimax
+    falls back to searching every board.
+    """
+    global opening_book
+    try:
+        with open(filename, "rb") as f:
+            opening_book = f.read()
+    except FileNotFoundError:
+        opening_book = bytes()
+    if opening_book and len(opening_book) != BOOK_SIZE:
+        raise ValueError(f"{filename} is not an opening book")
+
+
+def book_entry(x, o):
+    """
+    Returns the best cell (None if the game is over) and the value of the
+    (x, o) bitboard from the opening book, or None if it isn't in the book.
+    """
+    if opening_book is None:
+        load_book()
+    if not opening_book:
+        return None
+    entry = opening_book[TERNARY[x] + 2 * TERNARY[o]]
+    if entry == UNREACHABLE:
+        return None
+    cell = entry & NO_MOVE
+    return (None if cell == NO_MOVE else cell), (entry >> 4) - 1
+
+
+# Transposition table shared by every search, mapping the canonical key
+# of a board to the depth it was searched to, its value and whether that
+# value is exact or only a bound, and counters of how it is used
+transpositions = dict()
+table_hits = 0
+table_misses = 0
+nodes_searched = 0
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Depth stored for terminal boards, deep enough to satisfy any search
+FULL_DEPTH = 9
+
+# For each of the 8 symmetries of the board (rotations and reflections),
+# the mask every 9-bit mask is mapped to
+SYMMETRIES = []
+for _rotations in range(4):
+    for _reflect in (False, True):
+        _cells = list(CELLS)
+        for _ in range(_rotations):
+            _cells = [(j, 2 - i) for i, j in _cells]
+        if _reflect:
+            _cells = [(i, 2 - j) for i, j in _cells]
+        _sources = [3 * i + j for i, j in _cells]
+        SYMMETRIES.append([
+            sum(1 << cell for cell, source in enumerate(_sources) if mask >> source & 1)
+            for mask in range(1 << 9)
+        ])
+
+# Search order for moves: the center first, then corners, then edges, as
+# those take part in the most winning lines
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+
+
+def canonical(x, o):
+    """
+    Returns a key shared by the bitboard and all bitboards that are
+    rotations or reflections of it.
+    """
+    return min(symmetry[x] << 9 | symmetry[o] for symmetry in SYMMETRIES)
+
+
+def clear_table():
+    """
+    Empties the transposition table and resets the search counters.
+    """
+    global table_hits, table_misses, nodes_searched
+    transpositions.clear()
+    table_hits = 0
+    table_misses = 0
+    nodes_searched = 0
+
+
+def table_stats():
+    """
+    Returns the size of the transposition table, how often lookups have
+    found a usable value and how many nodes have been searched.
+    """
+    lookups = table_hits + table_misses
+    return {
+        "size": len(transpositions),
+        "hits": table_hits,
+        "misses": table_misses,
+        "hit_rate": table_hits / lookups if lookups else 0,
+        "nodes": nodes_searched,
+    }
+
+
+def search(x, o, depth, alpha, beta, ordered):
+    """
+    Returns the alpha-beta value of the (x, o) bitboard searched `depth`
+    moves ahead, as described in `alphabeta`.
+    """
+    global table_hits, table_misses, nodes_searched
+    nodes_searched += 1
+
+    key = canonical(x, o)
+    entry = transpositions.get(key)
+    if entry is not None and entry[0] >= depth:
+        _, v, bound = entry
+        if (bound == EXACT or (bound == LOWER and v >= beta)
+                or (bound == UPPER and v <= alpha)):
+            table_hits += 1
+            return v
+    table_misses += 1
+
+    if bitboard_terminal(x, o):
+        v = bitboard_utility(x, o)
+        transpositions[key] = (FULL_DEPTH, v, EXACT)
+        return v
+    if depth == 0:
         return 0
 
-def minimax(board):
+    taken = x | o
+    cells = MOVE_ORDER if ordered else range(9)
+    moves = [1 << cell for cell in cells if not taken >> cell & 1]
+
+    #X raises alpha and O lowers beta until the window closes.
+    original_alpha, original_beta = alpha, beta
+    if POPCOUNT[x] == POPCOUNT[o]:
+        v = -2
+        for move in moves:
+            v = max(v, search(x | move, o, depth - 1, alpha, beta, ordered))
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
+    else:
+        v = 2
+        for move in moves:
+            v = min(v, search(x, o | move, depth - 1, alpha, beta, ordered))
+            beta = min(beta, v)
+            if alpha >= beta:
+                break
+
+    if v <= original_alpha:
+        bound = UPPER
+    elif v >= original_beta:
+        bound = LOWER
+    else:
+        bound = EXACT
+    transpositions[key] = (depth, v, bound)
+    return v
+
+
+def alphabeta(board, depth, alpha=-2, beta=2, ordered=True):
+    """
+    Returns the minimax value of the board searched `depth` moves ahead,
+    counting unfinished games at the depth limit as ties. If the value is
+    at most `alpha` or at least `beta` only that bound is guaranteed.
+    With `ordered`, moves are tried center first, then corners, then edges.
+    """
+    x, o = to_bitboard(board)
+    return search(x, o, depth, alpha, beta, ordered)
+
+
+def value(board):
+    """
+    Returns the minimax value of the board: 1 if X wins with perfect play,
+    -1 if O wins, 0 for a tie.
+    """
+    x, o = to_bitboard(board)
+    return search(x, o, 9 - POPCOUNT[x | o], -2, 2, True)
+
+
+def minimax(board, ordered=True, iterative=False, use_book=True):
     """
     Returns the optimal action for the current player on the board.
+
+    Boards in the opening book are answered from it without searching,
+    unless `use_book` is False. With `iterative`, the board is searched one
+    move deeper at a time and the search stops as soon as a forced result
+    is found, so the quickest of several winning moves is played.
     """
-    if terminal(board) == True:
+    x, o = to_bitboard(board)
+    if bitboard_terminal(x, o):
         return None
-    
-    if player(board) == X:
-        #start off with a value of -2 to make sure any action is better than it so we look for best action. 
-        #same is true bellow for when O plays except with a positive number.
-        v = [-2,(-1,-1)]
-        for every in actions(board):
-            if minma(result(board, every)) > v[0]:
-                v[1] = every
-                v[0] = minma(result(board, every))
-        return v[1] 
-
-    if player(board) == O:
-        w = [2,(-2,-2)]
-        for every in actions(board):
-            if maxima(result(board, every)) < w[0]:
-                w[1] = every
-                w[0] = maxima(result(board, every))
-        return w[1]
-
-def maxima(board):
-    v = -2
-    if terminal(board):
-        return utility(board)
-    for every in actions(board):
-        v = max(v,minma(result(board,every)))
-    return v 
-
-def minma(board):
-    v = 2
-    if terminal(board):
-        return utility(board)
-    for every in actions(board):
-        v = min(v,maxima(result(board,every)))
-    return v 
+
+    if use_book and not iterative:
+        entry = book_entry(x, o)
+        if entry is not None:
+            return CELLS[entry[0]]
+
+    empty = 9 - POPCOUNT[x | o]
+    depths = range(1, empty + 1) if iterative else [empty]
+    for depth in depths:
+
+        #X keeps the first action with the highest value, O the lowest. Each
+        #action only has to be searched well enough to see if it beats the best so far.
+        best_cell = None
+        if bitboard_player(x, o) == X:
+            best = -2
+            for cell in bitboard_actions(x, o):
+                v = search(x | 1 << cell, o, depth - 1, best, 2, ordered)
+                if v > best:
+                    best, best_cell = v, cell
+                if best == 1:
+                    break
+        else:
+            best = 2
+            for cell in bitboard_actions(x, o):
+                v = search(x, o | 1 << cell, depth - 1, -2, best, ordered)
+                if v < best:
+                    best, best_cell = v, cell
+                if best == -1:
+                    break
+
+        #Wins and losses are never guessed at the depth limit, so they are final.
+        if best != 0:
+            break
+
+    return CELLS[best_cell]